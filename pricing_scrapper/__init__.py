@@ -1,6 +1,24 @@
 """Pricing Scraper package."""
 
-from .knbk import Category, Product, parse_category_products, scrape_category_products
-
-__all__ = ["Category", "Product", "parse_category_products", "scrape_category_products"]
+from .cache import DiskCache
+from .export import dump_catalog, dump_products_jsonl
+from .knbk import (
+    Category,
+    Product,
+    iter_category_products,
+    parse_category_products,
+    parse_category_products_stream,
+    scrape_category_products,
+)
 
+__all__ = [
+    "Category",
+    "DiskCache",
+    "Product",
+    "dump_catalog",
+    "dump_products_jsonl",
+    "iter_category_products",
+    "parse_category_products",
+    "parse_category_products_stream",
+    "scrape_category_products",
+]
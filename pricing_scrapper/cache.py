@@ -0,0 +1,75 @@
+"""On-disk cache for fetched HTML pages."""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "pricing_scrapper"
+
+
+class DiskCache:
+    """Store fetched pages on disk, keyed by a hash of their URL.
+
+    Entries older than *ttl_seconds* are treated as missing and refetched;
+    ``ttl_seconds=None`` keeps entries forever.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[Path | str] = None,
+        *,
+        ttl_seconds: Optional[float] = 3600,
+    ) -> None:
+        self.directory = Path(directory) if directory is not None else DEFAULT_CACHE_DIR
+        self.ttl_seconds = ttl_seconds
+
+    def _path(self, url: str) -> Path:
+        digest = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return self.directory / digest[:2] / f"{digest}.html"
+
+    def get(self, url: str) -> Optional[str]:
+        """Return the cached page for *url*, or ``None`` if absent or stale."""
+
+        path = self._path(url)
+        try:
+            if self.ttl_seconds is not None:
+                age = time.time() - path.stat().st_mtime
+                if age >= self.ttl_seconds:
+                    return None
+            return path.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return None
+
+    def put(self, url: str, html_text: str) -> None:
+        """Store *html_text* as the cached page for *url*."""
+
+        path = self._path(url)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a private temporary file first so concurrent readers never
+        # observe a partially written page.
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_path.write_text(html_text, encoding="utf-8")
+        os.replace(tmp_path, path)
+
+    def get_or_fetch(self, url: str, fetcher: Callable[[str], str]) -> str:
+        """Return the cached page for *url*, calling *fetcher* on a miss."""
+
+        cached = self.get(url)
+        if cached is not None:
+            return cached
+        html_text = fetcher(url)
+        self.put(url, html_text)
+        return html_text
+
+    def wrap(self, fetcher: Callable[[str], str]) -> Callable[[str], str]:
+        """Return a fetch callable that consults the cache before *fetcher*."""
+
+        def cached_fetch(url: str) -> str:
+            return self.get_or_fetch(url, fetcher)
+
+        return cached_fetch
@@ -0,0 +1,63 @@
+"""Write scraped categories and products to JSON files."""
+
+from __future__ import annotations
+
+import json
+from dataclasses import asdict, is_dataclass
+from pathlib import Path
+from typing import Iterable, Tuple
+
+from .knbk import Category, Product
+
+try:  # pragma: no cover - optional dependency that may not be installed in tests
+    import orjson
+except ImportError:  # pragma: no cover - fall back to the stdlib encoder
+    orjson = None
+
+
+def _encode_dataclass(value: object) -> dict:
+    if is_dataclass(value) and not isinstance(value, type):
+        return asdict(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _dumps(value: object) -> bytes:
+    # orjson serialises dataclasses natively; the stdlib fallback converts them
+    # through ``default``. Both produce compact, non-ASCII-escaped UTF-8, so the
+    # files are identical whichever encoder is installed.
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(
+        value, ensure_ascii=False, separators=(",", ":"), default=_encode_dataclass
+    ).encode("utf-8")
+
+
+def dump_catalog(categories: Iterable[Category], path: Path | str) -> None:
+    """Write *categories* to *path* as a single JSON array."""
+
+    with open(path, "wb") as handle:
+        handle.write(_dumps(list(categories)))
+        handle.write(b"\n")
+
+
+def dump_products_jsonl(items: Iterable[Tuple[str, Product]], path: Path | str) -> int:
+    """Write ``(category_name, product)`` pairs to *path* as JSON Lines.
+
+    *items* is consumed lazily, so it can come straight from
+    :func:`~pricing_scrapper.knbk.iter_category_products`. Returns the number
+    of records written.
+    """
+
+    count = 0
+    with open(path, "wb") as handle:
+        for category_name, product in items:
+            record = {
+                "category": category_name,
+                "name": product.name,
+                "price": product.price,
+                "url": product.url,
+            }
+            handle.write(_dumps(record))
+            handle.write(b"\n")
+            count += 1
+    return count
@@ -3,13 +3,24 @@
 from __future__ import annotations
 
 import html
+import os
 import re
+import sys
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass, field
+from functools import lru_cache
 from html.parser import HTMLParser
-from typing import Callable, Dict, Iterable, List, Optional
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
 from urllib.parse import urldefrag, urljoin, urlparse
 
+from .cache import DiskCache
+
+try:  # pragma: no cover - optional dependency that may not be installed in tests
+    from lxml import etree
+except ImportError:  # pragma: no cover - fall back to the stdlib tokenizer
+    etree = None
+
 
 @dataclass(slots=True)
 class Product:
@@ -32,13 +43,16 @@ class Category:
 class _Element:
     tag: str
     attrs: dict[str, str]
+    # Casefolded once per element; every classifier below matches against
+    # these instead of re-splitting and re-folding the raw attributes.
+    classes: Tuple[str, ...] = field(init=False)
+    qaid: str = field(init=False)
 
-    @property
-    def classes(self) -> Iterable[str]:
-        raw = self.attrs.get("class")
-        if not raw:
-            return ()
-        return tuple(part for part in re.split(r"\s+", raw) if part)
+    def __post_init__(self) -> None:
+        raw_class = self.attrs.get("class")
+        self.classes = tuple(raw_class.casefold().split()) if raw_class else ()
+        raw_qaid = self.attrs.get("data-qaid")
+        self.qaid = raw_qaid.casefold() if raw_qaid else ""
 
     def get(self, key: str, default: Optional[str] = None) -> Optional[str]:
         return self.attrs.get(key, default)
@@ -147,27 +161,31 @@ _EXCLUDED_PRICE_CLASS_KEYWORDS = (
 
 
 def _normalize_text(value: str) -> str:
-    value = html.unescape(value)
-    value = re.sub(r"\s+", " ", value)
-    return value.strip()
+    # str.split() uses the same whitespace definition as ``\s`` and drops the
+    # leading/trailing runs, so this collapses and strips in one C-level pass.
+    return " ".join(html.unescape(value).split())
 
 
 def _class_matches(element: _Element, keywords: Iterable[str]) -> bool:
-    classes = element.classes
-    for cls in classes:
-        lowered = cls.casefold()
+    for cls in element.classes:
         for keyword in keywords:
-            if keyword in lowered:
+            if keyword in cls:
                 return True
     return False
 
 
-def _dataqaid_matches(element: _Element, keywords: Iterable[str]) -> bool:
-    value = element.get("data-qaid")
-    if not value:
+def _dataqaid_matches(element: _Element, keywords: Tuple[str, ...]) -> bool:
+    qaid = element.qaid
+    if not qaid:
         return False
-    lowered = value.casefold()
-    return any(keyword in lowered for keyword in keywords)
+    return _qaid_contains(qaid, keywords)
+
+
+@lru_cache(maxsize=256)
+def _qaid_contains(qaid: str, keywords: Tuple[str, ...]) -> bool:
+    # A page only uses a handful of data-qaid values, so each (value,
+    # keyword set) pair is scanned once and every later element is a lookup.
+    return any(keyword in qaid for keyword in keywords)
 
 
 def _is_category_container(element: _Element) -> bool:
@@ -176,11 +194,10 @@ def _is_category_container(element: _Element) -> bool:
     if _dataqaid_matches(element, _CATEGORY_CONTAINER_DATA_QAID_KEYWORDS):
         return True
     for cls in element.classes:
-        lowered = cls.casefold()
-        if "__" in lowered:
+        if "__" in cls:
             continue
         for keyword in _CATEGORY_CONTAINER_CLASS_KEYWORDS:
-            if keyword in lowered:
+            if keyword in cls:
                 return True
     return False
 
@@ -222,27 +239,34 @@ def _is_product_price(element: _Element) -> bool:
         if _class_matches(element, _EXCLUDED_PRICE_CLASS_KEYWORDS):
             return False
         return True
-    data_role = element.get("data-qaid", "").casefold()
+    data_role = element.qaid
     if "price" in data_role and "old" not in data_role:
         return True
     return False
 
 
-class _KNBKPageParser(HTMLParser):
+class _KNBKPageBuilder:
+    """Turn start/end/data events into categories with their products."""
+
     def __init__(self) -> None:
-        super().__init__()
         self._elements: List[_Element] = []
         self._captures: List[_TextCapture] = []
         self._category_stack: List[_CategoryContext] = []
         self._product_stack: List[_ProductContext] = []
         self._categories: List[Category] = []
+        self._category_count = 0
 
-    # HTMLParser API -----------------------------------------------------
-    def handle_starttag(self, tag: str, attrs) -> None:  # type: ignore[override]
-        element = _Element(tag=tag, attrs=dict(attrs))
+    # Event API ----------------------------------------------------------
+    def start(self, tag: str, attrs: Dict[str, str]) -> None:
+        element = _Element(tag=tag, attrs=attrs)
         self._elements.append(element)
         depth = len(self._elements)
 
+        # Every classifier keys off class, data-qaid or itemprop; plain
+        # elements (<li>, <b>, <br>, ...) can be pushed without classifying.
+        if not (element.classes or element.qaid or "itemprop" in attrs):
+            return
+
         if _is_category_container(element):
             self._category_stack.append(_CategoryContext(element=element))
 
@@ -289,7 +313,7 @@ class _KNBKPageParser(HTMLParser):
                     )
                 )
 
-    def handle_endtag(self, tag: str) -> None:  # type: ignore[override]
+    def end(self, tag: str) -> None:
         if not self._elements:
             return
         element = self._elements.pop()
@@ -297,11 +321,7 @@ class _KNBKPageParser(HTMLParser):
         self._finalize_product(element)
         self._finalize_category(element)
 
-    def handle_startendtag(self, tag: str, attrs) -> None:  # type: ignore[override]
-        self.handle_starttag(tag, attrs)
-        self.handle_endtag(tag)
-
-    def handle_data(self, data: str) -> None:  # type: ignore[override]
+    def data(self, data: str) -> None:
         if not data:
             return
         for capture in self._captures:
@@ -319,7 +339,8 @@ class _KNBKPageParser(HTMLParser):
                 context = capture.context  # type: ignore[assignment]
                 assert isinstance(context, _CategoryContext)
                 if context.name is None:
-                    context.name = text
+                    # Category headings repeat on every paginated page.
+                    context.name = sys.intern(text)
             elif capture.role == "product_name":
                 context = capture.context  # type: ignore[assignment]
                 assert isinstance(context, _ProductContext)
@@ -329,7 +350,8 @@ class _KNBKPageParser(HTMLParser):
                 context = capture.context  # type: ignore[assignment]
                 assert isinstance(context, _ProductContext)
                 if context.price is None:
-                    context.price = text
+                    # Prices are low-cardinality ("1 675 ₴"); share one copy each.
+                    context.price = sys.intern(text)
 
     def _finalize_product(self, element: _Element) -> None:
         if not self._product_stack:
@@ -353,27 +375,139 @@ class _KNBKPageParser(HTMLParser):
         self._category_stack.pop()
         if not current.products:
             return
-        name = current.name or f"Category {len(self._categories) + 1}"
+        self._category_count += 1
+        name = current.name or f"Category {self._category_count}"
         self._categories.append(Category(name=name, products=current.products))
 
     # Public API ---------------------------------------------------------
+    def close(self) -> List[Category]:
+        return self.categories
+
     @property
     def categories(self) -> List[Category]:
         return list(self._categories)
 
+    def take_categories(self) -> List[Category]:
+        """Return the categories completed so far and forget them."""
+
+        categories = self._categories
+        self._categories = []
+        return categories
+
+
+class _KNBKPageParser(HTMLParser):
+    """Drive an event sink such as :class:`_KNBKPageBuilder` with the stdlib tokenizer."""
+
+    def __init__(self, sink) -> None:
+        super().__init__()
+        self._sink = sink
+
+    def handle_starttag(self, tag: str, attrs) -> None:  # type: ignore[override]
+        self._sink.start(tag, dict(attrs))
+
+    def handle_endtag(self, tag: str) -> None:  # type: ignore[override]
+        self._sink.end(tag)
+
+    def handle_startendtag(self, tag: str, attrs) -> None:  # type: ignore[override]
+        self.handle_starttag(tag, attrs)
+        self.handle_endtag(tag)
+
+    def handle_data(self, data: str) -> None:  # type: ignore[override]
+        self._sink.data(data)
+
+
+_PARSER_ENV_VAR = "KNBK_PARSER"
+_PARSER_BACKENDS = {"lxml", "html.parser"}
+
+
+@lru_cache(maxsize=None)
+def _parser_backend() -> str:
+    """Return the configured backend, validated once on first use.
+
+    Tests that change ``KNBK_PARSER`` call ``_parser_backend.cache_clear()``.
+    """
+
+    backend = os.environ.get(_PARSER_ENV_VAR, "").strip().casefold() or "lxml"
+    if backend not in _PARSER_BACKENDS:
+        raise ValueError(
+            f"Unsupported {_PARSER_ENV_VAR} value {backend!r}; "
+            f"expected one of {', '.join(sorted(_PARSER_BACKENDS))}"
+        )
+    return backend
+
+
+def _make_event_parser(sink):
+    """Return an incremental parser that reports start/end/data events to *sink*.
+
+    With lxml installed the sink becomes the libxml2 parser target, so no
+    element tree is materialised. Its recovery mode closes unterminated and
+    void elements, which keeps the sink's element stack aligned on tag-soup
+    markup. Otherwise, or when ``KNBK_PARSER=html.parser`` is set, the stdlib
+    :class:`~html.parser.HTMLParser` is used.
+    """
+
+    backend = _parser_backend()
+    if etree is not None and backend == "lxml":
+        return etree.HTMLParser(target=sink, recover=True)
+    return _KNBKPageParser(sink)
+
 
 def parse_category_products(html_text: str) -> List[Category]:
     """Parse *html_text* and return categories with their products.
 
     The function targets the structure used on knbk.in.ua catalog pages. It tries
     to be resilient by matching elements via common class and ``data-qaid``
-    patterns observed on the site.
+    patterns observed on the site. ``lxml`` is used for tokenizing when it is
+    installed; otherwise the stdlib :class:`~html.parser.HTMLParser` is used.
     """
 
-    parser = _KNBKPageParser()
+    builder = _KNBKPageBuilder()
+    parser = _make_event_parser(builder)
     parser.feed(html_text)
     parser.close()
-    return parser.categories
+    return builder.categories
+
+
+def parse_category_products_stream(html_chunks: Iterable[str]) -> Iterator[Category]:
+    """Yield categories from *html_chunks* as soon as each one is complete.
+
+    Unlike :func:`parse_category_products` the page does not have to be
+    available up front: chunks are fed to the incremental parser as they
+    arrive and every category is handed out once its container closes, so
+    only the category currently being parsed is held in memory.
+    """
+
+    builder = _KNBKPageBuilder()
+    parser = _make_event_parser(builder)
+    fed = False
+    for chunk in html_chunks:
+        if not chunk:
+            continue
+        parser.feed(chunk)
+        fed = True
+        yield from builder.take_categories()
+    if not fed:
+        # lxml refuses to close a parser that never saw any input.
+        parser.feed("")
+    parser.close()
+    yield from builder.take_categories()
+
+
+def iter_category_products(html_text: str) -> Iterator[Tuple[str, Product]]:
+    """Yield ``(category_name, product)`` pairs from *html_text* in page order.
+
+    This is a flat view of :func:`parse_category_products_stream` for
+    consumers that write products out one by one (CSV or JSON Lines) and
+    never need the grouped :class:`Category` objects.
+    """
+
+    chunks = (
+        html_text[offset : offset + _FEED_CHUNK_SIZE]
+        for offset in range(0, len(html_text), _FEED_CHUNK_SIZE)
+    )
+    for category in parse_category_products_stream(chunks):
+        for product in category.products:
+            yield category.name, product
 
 
 _NEXT_TEXT_SYMBOLS = {">", ">>", "»", "›", "→"}
@@ -387,12 +521,15 @@ _NEXT_TEXT_KEYWORDS = {
     "далее",
     "далі",
 }
+# "наступна", "следующая", "далее"/"далі", "вперёд"/"вперед" and their
+# inflections; one C-level startswith call checks them all.
+_NEXT_TEXT_PREFIXES = ("наступ", "следующ", "дал", "вперёд", "вперед")
 _NEXT_ATTR_KEYWORDS = (
     "next",
     "pagination_next",
     "pager_next",
 )
-_NEXT_CLASS_HINTS = (
+_NEXT_CLASS_HINTS = {
     "pagination__next",
     "pagination-next",
     "pagination_next",
@@ -404,7 +541,8 @@ _NEXT_CLASS_HINTS = (
     "nav-next",
     "arrow-next",
     "btn-next",
-)
+}
+_NEXT_CLASS_CONTEXT_HINTS = ("pag", "pager", "page", "nav", "arrow", "btn")
 _PLACEHOLDER_CATEGORY_RE = re.compile(r"^Category \d+$")
 
 
@@ -417,15 +555,7 @@ def _text_looks_like_next(text: str) -> bool:
     lowered = normalized.casefold()
     if lowered in _NEXT_TEXT_KEYWORDS:
         return True
-    if lowered.startswith("наступ"):
-        return True
-    if lowered.startswith("следующ"):
-        return True
-    if lowered.startswith("дал"):
-        return True
-    if lowered.startswith("далі"):
-        return True
-    if lowered.startswith("вперёд") or lowered.startswith("вперед"):
+    if lowered.startswith(_NEXT_TEXT_PREFIXES):
         return True
     if normalized in _NEXT_TEXT_SYMBOLS:
         return True
@@ -433,7 +563,7 @@ def _text_looks_like_next(text: str) -> bool:
 
 
 def _split_classes(value: str) -> Iterable[str]:
-    return (part for part in re.split(r"\s+", value) if part)
+    return value.split()
 
 
 _DATA_LINK_ATTRIBUTE_CANDIDATES = (
@@ -483,7 +613,7 @@ def _link_attrs_next_href(attrs: Dict[str, str]) -> Optional[str]:
         return None
 
     rel = attrs.get("rel")
-    if rel and any(part.casefold() == "next" for part in re.split(r"\s+", rel)):
+    if rel and "next" in rel.casefold().split():
         return href
 
     for key in ("data-qaid", "data-role", "data-action", "data-direction"):
@@ -506,37 +636,36 @@ def _link_attrs_next_href(attrs: Dict[str, str]) -> Optional[str]:
             if lowered in _NEXT_CLASS_HINTS:
                 return href
             if "next" in lowered and any(
-                hint in lowered for hint in ("pag", "pager", "page", "nav", "arrow", "btn")
+                hint in lowered for hint in _NEXT_CLASS_CONTEXT_HINTS
             ):
                 return href
 
     return None
 
 
-class _PaginationParser(HTMLParser):
+class _PaginationTracker:
+    """Event sink that remembers the first link pointing to the next page."""
+
     def __init__(self) -> None:
-        super().__init__()
         self.next_href: Optional[str] = None
         self._current_candidate_tag: Optional[str] = None
         self._current_candidate_href: Optional[str] = None
         self._candidate_depth = 0
         self._buffer: List[str] = []
 
-    def handle_starttag(self, tag: str, attrs) -> None:  # type: ignore[override]
+    def start(self, tag: str, attrs: Dict[str, str]) -> None:
         if self.next_href is not None:
             return
 
-        attrs_dict: Dict[str, str] = dict(attrs)
-
         if tag in {"link", "a", "button"}:
-            next_href = _link_attrs_next_href(attrs_dict)
+            next_href = _link_attrs_next_href(attrs)
             if next_href:
                 self.next_href = next_href
                 self._reset_candidate()
                 return
 
         if tag in {"a", "button"}:
-            href_candidate = _extract_href_candidate(attrs_dict)
+            href_candidate = _extract_href_candidate(attrs)
             if href_candidate:
                 self._current_candidate_tag = tag
                 self._current_candidate_href = href_candidate
@@ -549,7 +678,7 @@ class _PaginationParser(HTMLParser):
         if self._current_candidate_tag is not None:
             self._candidate_depth += 1
 
-    def handle_endtag(self, tag: str) -> None:  # type: ignore[override]
+    def end(self, tag: str) -> None:
         if self._current_candidate_tag is None:
             return
 
@@ -569,11 +698,7 @@ class _PaginationParser(HTMLParser):
 
         self._reset_candidate()
 
-    def handle_startendtag(self, tag: str, attrs) -> None:  # type: ignore[override]
-        self.handle_starttag(tag, attrs)
-        self.handle_endtag(tag)
-
-    def handle_data(self, data: str) -> None:  # type: ignore[override]
+    def data(self, data: str) -> None:
         if self.next_href is not None:
             return
         if self._current_candidate_tag is not None:
@@ -586,15 +711,33 @@ class _PaginationParser(HTMLParser):
         self._buffer = []
 
 
-def _find_next_page_url(html_text: str, base_url: str) -> Optional[str]:
-    parser = _PaginationParser()
-    parser.feed(html_text)
-    parser.close()
+class _PageEvents:
+    """Fan parser events out to the product builder and the pagination tracker."""
 
-    href = parser.next_href
-    if not href:
+    __slots__ = ("builder", "pagination")
+
+    def __init__(self, builder: _KNBKPageBuilder, pagination: _PaginationTracker) -> None:
+        self.builder = builder
+        self.pagination = pagination
+
+    def start(self, tag: str, attrs: Dict[str, str]) -> None:
+        self.builder.start(tag, attrs)
+        self.pagination.start(tag, attrs)
+
+    def end(self, tag: str) -> None:
+        self.builder.end(tag)
+        self.pagination.end(tag)
+
+    def data(self, data: str) -> None:
+        self.builder.data(data)
+        self.pagination.data(data)
+
+    def close(self) -> None:
         return None
 
+
+@lru_cache(maxsize=4096)
+def _resolve_next_url(href: str, base_url: str) -> Optional[str]:
     joined = urljoin(base_url, href)
     if not joined:
         return None
@@ -610,42 +753,171 @@ def _find_next_page_url(html_text: str, base_url: str) -> Optional[str]:
     return parsed._replace(fragment="").geturl()
 
 
+_FEED_CHUNK_SIZE = 64 * 1024
+
+# Elements that can carry the pagination link, plus the regions whose
+# contents are not markup so that links inside them are stepped over. A link's
+# text never runs past the next ``<a``/``<button`` or closing tag of either,
+# so unclosed anchors cost one pass over their own text, not the whole page.
+_NEXT_LINK_SCAN_RE = re.compile(
+    r"<(a|button)\b[^>]*>[^<]*(?:<(?!/?(?:a|button)\b)[^<]*)*(?:</\1\s*>)?"
+    r"|<link\b[^>]*>|<(script|style)\b.*?</\2\s*>|<!--.*?-->",
+    re.IGNORECASE | re.DOTALL,
+)
+
+
+def _prescan_next_href(html_text: str) -> Optional[str]:
+    """Find the pagination link without tokenizing the whole page.
+
+    Only the link-like elements are fed to the pagination tracker, so the
+    next page can be requested before the product parse starts even when the
+    link sits at the bottom of the page. The full parse stays authoritative.
+    """
+
+    pagination = _PaginationTracker()
+    parser = _KNBKPageParser(pagination)
+    for match in _NEXT_LINK_SCAN_RE.finditer(html_text):
+        if match.group(2) is not None or match.group().startswith("<!--"):
+            continue
+        parser.feed(match.group())
+        if pagination.next_href is not None:
+            return pagination.next_href
+    return None
+
+
+def _parse_page(
+    html_text: str,
+    base_url: str,
+    *,
+    on_next_url: Optional[Callable[[str], None]] = None,
+) -> Tuple[List[Category], Optional[str]]:
+    """Collect categories and the next-page URL from *html_text* in one pass.
+
+    When *on_next_url* is given, a regex prescan of the link-like elements
+    reports the likely next page before the product parse begins. The page is
+    then fed to the parser in chunks, and *on_next_url* fires again as soon as
+    the parser has seen the pagination link itself; callers are expected to
+    ignore a URL they have already been given.
+    """
+
+    builder = _KNBKPageBuilder()
+    pagination = _PaginationTracker()
+    parser = _make_event_parser(_PageEvents(builder, pagination))
+    next_url: Optional[str] = None
+    reported = False
+
+    def report() -> None:
+        nonlocal next_url, reported
+        if reported or pagination.next_href is None:
+            return
+        reported = True
+        next_url = _resolve_next_url(pagination.next_href, base_url)
+        if next_url and on_next_url is not None:
+            on_next_url(next_url)
+
+    if on_next_url is not None:
+        hinted_href = _prescan_next_href(html_text)
+        if hinted_href is not None:
+            hinted_url = _resolve_next_url(hinted_href, base_url)
+            if hinted_url:
+                on_next_url(hinted_url)
+
+    # At least one feed call, even for an empty page, so that closing the
+    # lxml feed parser does not fail with "no element found".
+    for offset in range(0, max(len(html_text), 1), _FEED_CHUNK_SIZE):
+        parser.feed(html_text[offset : offset + _FEED_CHUNK_SIZE])
+        report()
+    parser.close()
+    report()
+
+    return builder.categories, next_url
+
+
 def scrape_category_products(
-    url: str, *, fetch: Callable[[str], str]
+    url: str,
+    *,
+    fetch: Callable[[str], str],
+    cache: Optional[DiskCache] = None,
+    prefetch: bool = False,
 ) -> List[Category]:
-    """Fetch *url* and follow pagination links to collect all products."""
+    """Fetch *url* and follow pagination links to collect all products.
+
+    Each page is tokenized once for both its products and its pagination
+    link, and pages are requested in order. When a *cache* is given, pages it
+    already holds are not fetched again.
+
+    By default *fetch* is only ever called on the calling thread. With
+    ``prefetch=True`` a cheap prescan finds the next link first and the next
+    page is requested on a background thread, so its network latency overlaps
+    with parsing the current page wherever the link sits. Only one fetch is in
+    flight at a time, but *fetch* must then be safe to call from another
+    thread, which rules out thread-bound clients such as a Playwright sync-API
+    page.
+    """
+
+    if cache is not None:
+        fetch = cache.wrap(fetch)
 
     aggregated: Dict[str, Category] = {}
     placeholder_counter = 0
     ordered_keys: List[str] = []
-    seen_urls: set[str] = set()
-
-    next_url: Optional[str] = url
 
-    while next_url and next_url not in seen_urls:
-        seen_urls.add(next_url)
-        html_text = fetch(next_url)
-        page_categories = parse_category_products(html_text)
-
-        for category in page_categories:
-            if _PLACEHOLDER_CATEGORY_RE.match(category.name):
-                key = f"__placeholder_{placeholder_counter}"
-                placeholder_counter += 1
-            else:
-                key = category.name
-
-            existing = aggregated.get(key)
-            if existing is None:
-                aggregated[key] = Category(
-                    name=category.name, products=list(category.products)
-                )
-                ordered_keys.append(key)
+    if not url:
+        return []
+
+    seen_urls: set[str] = {url}
+    current_url = url
+    html_text = fetch(url)
+
+    executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+    prefetched: Dict[str, Future[str]] = {}
+
+    def submit_next(next_url: str) -> None:
+        if next_url not in seen_urls:
+            seen_urls.add(next_url)
+            prefetched[next_url] = executor.submit(fetch, next_url)
+
+    try:
+        while True:
+            page_categories, next_url = _parse_page(
+                html_text,
+                current_url,
+                on_next_url=submit_next if executor is not None else None,
+            )
+
+            for category in page_categories:
+                if _PLACEHOLDER_CATEGORY_RE.match(category.name):
+                    key = f"__placeholder_{placeholder_counter}"
+                    placeholder_counter += 1
+                else:
+                    key = category.name
+
+                existing = aggregated.get(key)
+                if existing is None:
+                    aggregated[key] = Category(
+                        name=category.name, products=list(category.products)
+                    )
+                    ordered_keys.append(key)
+                else:
+                    existing.products.extend(category.products)
+
+            if not next_url:
+                break
+            if executor is None:
+                if next_url in seen_urls:
+                    break
+                seen_urls.add(next_url)
+                html_text = fetch(next_url)
             else:
-                existing.products.extend(category.products)
-
-        next_url = _find_next_page_url(html_text, next_url)
-        if next_url in seen_urls:
-            break
+                pending = prefetched.pop(next_url, None)
+                if pending is None:
+                    break
+                html_text = pending.result()
+            current_url = next_url
+    finally:
+        if executor is not None:
+            # Only prescan hints the full parse did not confirm are left
+            # here; returning must not wait for them.
+            executor.shutdown(wait=False, cancel_futures=True)
 
     return [aggregated[key] for key in ordered_keys]
-
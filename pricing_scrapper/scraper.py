@@ -4,22 +4,36 @@ from __future__ import annotations
 
 import html
 import re
+import sys
 from collections import Counter
 from dataclasses import dataclass
 from html.parser import HTMLParser
 from typing import Iterable, List, Optional, Sequence, Tuple
 
+# Thousands groups such as " 200" or ",000". A possessive repetition (Python
+# 3.11+) never gives back a group it has taken: nothing after it can match
+# what a group consumed, so backtracking into it only burns time on long
+# digit runs that end without a currency.
+_THOUSANDS_GROUPS = r"(?:[\d.,\s]\d{3})" + ("*+" if sys.version_info >= (3, 11) else "*")
+
 PRICE_PATTERN = re.compile(
     r"""
-    (?:(?:[$€£₴]|USD|EUR|GBP|UAH)\s?\d{1,3}(?:[\d.,\s]\d{3})*(?:[\d.,]\d{2})?)
-    |
-    (?:\d{1,3}(?:[\d.,\s]\d{3})*(?:[\d.,]\d{2})?\s?(?:USD|EUR|GBP|UAH|₴))
-    """,
+    # Every price starts with a currency symbol, a currency code or a digit;
+    # rejecting all other positions up front keeps finditer from trying both
+    # alternatives at every character of the page.
+    (?=[$€£₴UEG\d])
+    (?:
+        (?:(?:[$€£₴]|USD|EUR|GBP|UAH)\s?\d{1,3}%(thousands)s(?:[\d.,]\d{2})?)
+        |
+        (?:\d{1,3}%(thousands)s(?:[\d.,]\d{2})?\s?(?:USD|EUR|GBP|UAH|₴))
+    )
+    """
+    % {"thousands": _THOUSANDS_GROUPS},
     re.IGNORECASE | re.VERBOSE,
 )
 
 
-@dataclass
+@dataclass(slots=True)
 class PriceResult:
     """Representation of an extracted price and its surrounding context."""
 
@@ -28,7 +42,7 @@ class PriceResult:
     availability: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class _TextNode:
     """Representation of visible text extracted from the HTML document."""
 
@@ -39,18 +53,26 @@ class _TextNode:
 class _StackEntry:
     """Internal helper representing a tag currently open in the parser."""
 
-    __slots__ = ("tag", "index", "child_counts")
+    __slots__ = ("tag", "index", "child_counts", "path")
 
-    def __init__(self, tag: str, index: int) -> None:
+    def __init__(
+        self, tag: str, index: int, parent_path: Tuple[Tuple[str, int], ...] = ()
+    ) -> None:
         self.tag = tag
         self.index = index
         self.child_counts: Counter[str] = Counter()
+        # Structural path from the root down to and including this entry;
+        # built once per element and shared by all of its text nodes.
+        self.path = parent_path + ((tag, index),)
 
     @property
     def identity(self) -> Tuple[str, int]:
         return (self.tag, self.index)
 
 
+_HIDDEN_TAGS = frozenset({"script", "style"})
+
+
 class _VisibleTextParser(HTMLParser):
     """Collect visible text nodes while preserving a structural path."""
 
@@ -58,6 +80,9 @@ class _VisibleTextParser(HTMLParser):
         super().__init__()
         self._stack: list[_StackEntry] = []
         self._root_counts: Counter[str] = Counter()
+        # Number of open <script>/<style> entries on the stack, so text nodes
+        # can be classified without scanning every ancestor.
+        self._hidden_depth = 0
         self.nodes: list[_TextNode] = []
 
     # HTMLParser API -----------------------------------------------------
@@ -66,25 +91,31 @@ class _VisibleTextParser(HTMLParser):
             parent = self._stack[-1]
             index = parent.child_counts[tag]
             parent.child_counts[tag] += 1
+            parent_path = parent.path
         else:
             index = self._root_counts[tag]
             self._root_counts[tag] += 1
-        self._stack.append(_StackEntry(tag, index))
+            parent_path = ()
+        self._stack.append(_StackEntry(tag, index, parent_path))
+        if tag in _HIDDEN_TAGS:
+            self._hidden_depth += 1
 
     def handle_endtag(self, tag: str) -> None:  # type: ignore[override]
         if self._stack:
-            self._stack.pop()
+            entry = self._stack.pop()
+            if entry.tag in _HIDDEN_TAGS:
+                self._hidden_depth -= 1
 
     def handle_data(self, data: str) -> None:  # type: ignore[override]
         if not data:
             return
-        if any(entry.tag in {"script", "style"} for entry in self._stack):
+        if self._hidden_depth:
             return
         text = data.strip()
         if not text:
             return
         text = html.unescape(text)
-        path = tuple(entry.identity for entry in self._stack)
+        path = self._stack[-1].path if self._stack else ()
         self.nodes.append(_TextNode(text=text, path=path))
 
 
@@ -179,6 +210,32 @@ _AVAILABILITY_IN_STOCK_MARKERS = _compile_availability_markers(
 )
 
 
+# Literal stems at least one of which every marker in the matching list
+# requires. Most texts mention no availability at all, and a few substring
+# checks rule that out far faster than running each marker regex in turn.
+_AVAILABILITY_OUT_OF_STOCK_STEMS = (
+    "нема",
+    "нет",
+    "відсут",
+    "отсутств",
+    "закінч",
+    "законч",
+    "замовлен",
+    "заказ",
+    "очікуєт",
+    "ожидает",
+    "sold",
+    "stock",
+)
+_AVAILABILITY_IN_STOCK_STEMS = (
+    "наявн",
+    "налич",
+    "склад",
+    "відправк",
+    "отправк",
+)
+
+
 def _gather_visible_text(
     text: str, *, start: int, direction: int, limit: int
 ) -> str:
@@ -231,16 +288,40 @@ def _gather_visible_text(
     return "".join(buffer)
 
 
-def _is_inside_html_tag(text: str, index: int) -> bool:
-    """Return ``True`` if *index* is positioned within an HTML tag."""
+class _TagTracker:
+    """Answer "is this offset inside an HTML tag?" for increasing offsets.
 
-    lt_index = text.rfind("<", 0, index)
-    if lt_index == -1:
-        return False
-    gt_index = text.rfind(">", 0, index)
-    if gt_index > lt_index:
-        return False
-    return True
+    The last ``<`` and ``>`` seen so far are remembered, so each query only
+    scans the text between the previous offset and the new one and a full
+    pass over the page stays linear instead of rescanning from the start.
+    An offset before the previous one is still answered correctly, at the
+    cost of rescanning from the start of the text.
+    """
+
+    __slots__ = ("_text", "_pos", "_last_lt", "_last_gt")
+
+    def __init__(self, text: str) -> None:
+        self._text = text
+        self._pos = 0
+        self._last_lt = -1
+        self._last_gt = -1
+
+    def inside(self, index: int) -> bool:
+        """Return ``True`` if *index* is positioned within an HTML tag."""
+
+        if index < self._pos:
+            self._pos = 0
+            self._last_lt = -1
+            self._last_gt = -1
+        if index > self._pos:
+            lt_index = self._text.rfind("<", self._pos, index)
+            if lt_index != -1:
+                self._last_lt = lt_index
+            gt_index = self._text.rfind(">", self._pos, index)
+            if gt_index != -1:
+                self._last_gt = gt_index
+            self._pos = index
+        return self._last_lt != -1 and self._last_gt < self._last_lt
 
 
 def _visible_text_window(text: str, start: int, end: int, context: int) -> str:
@@ -250,10 +331,12 @@ def _visible_text_window(text: str, start: int, end: int, context: int) -> str:
 
 
 def _clean_snippet(snippet: str) -> str:
-    text = _TAG_RE.sub(" ", snippet)
+    # Windows from _visible_text_window already skip markup, so the tag
+    # substitution is only needed for snippets that still contain a tag.
+    text = _TAG_RE.sub(" ", snippet) if "<" in snippet else snippet
     text = html.unescape(text)
-    text = _WHITESPACE_RE.sub(" ", text)
-    return text.strip()
+    # str.split() and ``\s`` share the same whitespace definition.
+    return " ".join(text.split())
 
 
 def _collect_text_nodes(html_text: str) -> list[_TextNode]:
@@ -431,8 +514,14 @@ def _normalize_availability_value(value: str) -> str:
 
 
 def _match_availability_patterns(
-    text: str, patterns: Sequence[tuple[re.Pattern[str], Optional[str]]]
+    text: str,
+    patterns: Sequence[tuple[re.Pattern[str], Optional[str]]],
+    stems: Sequence[str],
 ) -> Optional[str]:
+    lowered = text.casefold()
+    if not any(stem in lowered for stem in stems):
+        return None
+    # Earlier patterns take priority over earlier positions in the text.
     for pattern, label in patterns:
         match = pattern.search(text)
         if match:
@@ -493,22 +582,30 @@ def _detect_availability(
         return None
 
     for text in primary:
-        result = _match_availability_patterns(text, _AVAILABILITY_OUT_OF_STOCK_MARKERS)
+        result = _match_availability_patterns(
+            text, _AVAILABILITY_OUT_OF_STOCK_MARKERS, _AVAILABILITY_OUT_OF_STOCK_STEMS
+        )
         if result:
             return result
 
     for text in primary:
-        result = _match_availability_patterns(text, _AVAILABILITY_IN_STOCK_MARKERS)
+        result = _match_availability_patterns(
+            text, _AVAILABILITY_IN_STOCK_MARKERS, _AVAILABILITY_IN_STOCK_STEMS
+        )
         if result:
             return result
 
     for text in fallback:
-        result = _match_availability_patterns(text, _AVAILABILITY_OUT_OF_STOCK_MARKERS)
+        result = _match_availability_patterns(
+            text, _AVAILABILITY_OUT_OF_STOCK_MARKERS, _AVAILABILITY_OUT_OF_STOCK_STEMS
+        )
         if result:
             return result
 
     for text in fallback:
-        result = _match_availability_patterns(text, _AVAILABILITY_IN_STOCK_MARKERS)
+        result = _match_availability_patterns(
+            text, _AVAILABILITY_IN_STOCK_MARKERS, _AVAILABILITY_IN_STOCK_STEMS
+        )
         if result:
             return result
 
@@ -551,19 +648,16 @@ def extract_prices(html_text: str, *, context: int = 60) -> List[PriceResult]:
 
     results: List[PriceResult] = []
     seen: set[tuple[str, str]] = set()
+    tags = _TagTracker(search_text)
 
     for match in PRICE_PATTERN.finditer(search_text):
-        if _is_inside_html_tag(search_text, match.start()):
+        start, end = match.span()
+        if tags.inside(start):
             continue
-        snippet = _clean_snippet(
-            _visible_text_window(
-                search_text,
-                max(match.start(), 0),
-                min(match.end(), len(search_text)),
-                context,
-            )
-        )
-        price = match.group().strip()
+        # Matches always begin and end on a non-space character, so the
+        # span can be used as-is for both the price and its context window.
+        price = search_text[start:end]
+        snippet = _clean_snippet(_visible_text_window(search_text, start, end, context))
 
         description: Optional[str] = None
         node_index = _locate_node_for_price(nodes, price, consumed_positions, node_cursor)
@@ -586,8 +680,14 @@ def extract_prices(html_text: str, *, context: int = 60) -> List[PriceResult]:
         if key in seen:
             continue
         seen.add(key)
+        # Prices and availability labels repeat heavily across a listing;
+        # keep a single copy of each string.
         results.append(
-            PriceResult(description=description, price=price, availability=availability)
+            PriceResult(
+                description=description,
+                price=sys.intern(price),
+                availability=sys.intern(availability) if availability else availability,
+            )
         )
 
     return results
@@ -598,9 +698,11 @@ def iter_prices(html_text: str) -> Iterable[str]:
 
     search_text = _SCRIPT_STYLE_RE.sub(" ", html_text)
     search_text = html.unescape(search_text)
+    tags = _TagTracker(search_text)
 
     for match in PRICE_PATTERN.finditer(search_text):
-        if _is_inside_html_tag(search_text, match.start()):
+        start, end = match.span()
+        if tags.inside(start):
             continue
-        yield match.group().strip()
+        yield search_text[start:end]
 
@@ -4,14 +4,23 @@ from __future__ import annotations
 
 import argparse
 import html
+import re
+import sys
 from collections import deque
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from contextlib import contextmanager
 from dataclasses import dataclass
+from email.message import Message
+from functools import lru_cache
 from html.parser import HTMLParser
 from http import HTTPStatus
 from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import BoundedSemaphore, local
+from typing import Iterator
 from urllib.error import HTTPError, URLError
-from urllib.parse import parse_qs, urljoin, urlparse, urlsplit, urlunsplit
+from urllib.parse import parse_qs, unquote_plus, urljoin, urlparse, urlsplit, urlunsplit
 from urllib.request import Request, urlopen
+from urllib.robotparser import RobotFileParser
 
 try:  # pragma: no cover - optional dependency that may not be installed in tests
     from playwright.sync_api import (
@@ -23,6 +32,11 @@ except ImportError:  # pragma: no cover - keep fallback behaviour when Playwrigh
     sync_playwright = None
     PlaywrightError = PlaywrightTimeoutError = Exception
 
+try:  # pragma: no cover - optional dependency that may not be installed in tests
+    import urllib3
+except ImportError:  # pragma: no cover - fall back to one connection per request
+    urllib3 = None
+
 from pricing_scrapper.scraper import PriceResult, extract_prices
 
 USER_AGENT = (
@@ -30,13 +44,35 @@ USER_AGENT = (
     "(KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36"
 )
 
+# Product token matched against robots.txt ``User-agent`` lines; the browser
+# string above would only ever match ``*`` groups.
+ROBOTS_USER_AGENT = "pricing-scrapper"
+
 REQUEST_TIMEOUT_SECONDS = 20
 REQUEST_TIMEOUT_MS = REQUEST_TIMEOUT_SECONDS * 1000
 
 MAX_PAGINATION_PAGES = 20
 
+MAX_CONCURRENT_SCRAPES = 8
+MAX_PENDING_SCRAPES = 16
+SCRAPE_TIMEOUT_SECONDS = 120
+
+# Shared keep-alive pool so that paginated crawls of one host reuse the same
+# TCP/TLS connection instead of paying a new handshake for every page.
+_HTTP = (
+    urllib3.PoolManager(
+        num_pools=4,
+        maxsize=10,
+        headers={"User-Agent": USER_AGENT},
+        timeout=REQUEST_TIMEOUT_SECONDS,
+        retries=urllib3.Retry(connect=3, read=3, redirect=10, backoff_factor=0.3),
+    )
+    if urllib3 is not None
+    else None
+)
+
 
-@dataclass
+@dataclass(slots=True)
 class _PaginationLink:
     href: str
     text: str
@@ -86,6 +122,10 @@ class _PaginationLinkParser(HTMLParser):
         elif self._nested_depth > 0:
             self._nested_depth -= 1
 
+    @property
+    def in_anchor(self) -> bool:
+        return self._current_attrs is not None
+
     def handle_data(self, data: str) -> None:  # type: ignore[override]
         if self._current_attrs is not None and data:
             self._current_text_parts.append(data)
@@ -109,18 +149,13 @@ _PAGINATION_TEXT_HINTS = {
 
 _PAGINATION_ARROW_TEXTS = {">", "»", "›", "→"}
 
-_PAGINATION_HREF_HINTS = (
-    "page=",
-    "paged=",
-    "pagination",
-    "per_page=",
-    "p=",
-    "offset=",
-    "start=",
-    "page/",
-)
+# Matches an href containing any of "page=", "paged=", "pagination",
+# "per_page=", "p=", "offset=", "start=" or "page/", factored on the shared
+# "pag" prefix so one C-level search replaces a substring test per hint.
+_PAGINATION_HREF_HINT_RE = re.compile(r"pag(?:e(?:d?=|/)|ination)|p=|offset=|start=")
 
 
+@lru_cache(maxsize=8192)
 def _normalize_url(url: str) -> str:
     parsed = urlsplit(url)
     normalized = parsed._replace(fragment="")
@@ -129,6 +164,13 @@ def _normalize_url(url: str) -> str:
     return urlunsplit((normalized.scheme, normalized.netloc, path, normalized.query, ""))
 
 
+@lru_cache(maxsize=8192)
+def _join_url(base: str, href: str) -> str:
+    # Pagination bars repeat the same hrefs on every page of a crawl, so most
+    # joins against the (stable) page URL are cache hits.
+    return urljoin(base, href)
+
+
 def _looks_like_pagination_link(link: _PaginationLink, absolute_url: str) -> bool:
     text_lower = link.text.strip().casefold()
     attrs_lower = " ".join(link.attrs.get(name, "") for name in ("rel", "class", "aria-label", "title"))
@@ -143,7 +185,7 @@ def _looks_like_pagination_link(link: _PaginationLink, absolute_url: str) -> boo
         return True
 
     href_lower = link.href.casefold()
-    if any(marker in href_lower for marker in _PAGINATION_HREF_HINTS):
+    if _PAGINATION_HREF_HINT_RE.search(href_lower):
         return True
 
     if "next" in attrs_lower:
@@ -151,8 +193,6 @@ def _looks_like_pagination_link(link: _PaginationLink, absolute_url: str) -> boo
 
     compact_text = text_lower.replace(" ", "")
     if compact_text.isdigit():
-        if any(marker in href_lower for marker in _PAGINATION_HREF_HINTS):
-            return True
         if "page" in attrs_lower or "pagination" in attrs_lower:
             return True
         parsed = urlsplit(absolute_url)
@@ -167,9 +207,64 @@ def _looks_like_pagination_link(link: _PaginationLink, absolute_url: str) -> boo
     return False
 
 
+# Anchor openings plus the regions whose contents are not markup, so that
+# ``<a`` inside scripts, styles or comments is skipped as the full parser would.
+_ANCHOR_SCAN_RE = re.compile(
+    r"<a[\s/>]|<(script|style)\b.*?</\1\s*>|<!--.*?-->", re.IGNORECASE | re.DOTALL
+)
+# Where a fresh anchor fragment stops: its own ``</a>``, or the start of the
+# next anchor, script, style or comment. An anchor without a close tag
+# (``<a name="top">``, ``<a .../>``, an omitted ``</a>``) must not run on into
+# a raw-text block whose ``</a>`` would leave the parser stuck inside it.
+_ANCHOR_END_RE = re.compile(r"</a\s*>|<a[\s/>]|<(?:script|style)\b|<!--", re.IGNORECASE)
+# Inside a link: its ``</a>``, stepping over any script, style or comment.
+_ANCHOR_CLOSE_SCAN_RE = re.compile(
+    r"</a\s*>|<(script|style)\b.*?</\1\s*>|<!--.*?-->", re.IGNORECASE | re.DOTALL
+)
+
+
+def _feed_anchor_regions(parser: _PaginationLinkParser, html_text: str) -> None:
+    """Feed *parser* the parts of *html_text* that can affect its anchors.
+
+    Markup between anchors is skipped by a C-level scan. While the parser is
+    inside a link, a raw-text element or an unfinished construct the text is
+    fed contiguously, so it sees what it would see given the whole document.
+    """
+
+    pos = 0
+    length = len(html_text)
+    while pos < length:
+        if parser.in_anchor or parser.cdata_elem is not None or parser.rawdata:
+            end = length
+            for close in _ANCHOR_CLOSE_SCAN_RE.finditer(html_text, pos):
+                if close.group(1) is None and close.group().startswith("</"):
+                    end = close.end()
+                    break
+            parser.feed(html_text[pos:end])
+            pos = end
+            continue
+
+        match = _ANCHOR_SCAN_RE.search(html_text, pos)
+        if match is None:
+            return
+        start = match.start()
+        if html_text[start + 1] not in "aA":
+            pos = match.end()
+            continue
+        end_match = _ANCHOR_END_RE.search(html_text, match.end())
+        if end_match is None:
+            end = length
+        elif end_match.group().startswith("</"):
+            end = end_match.end()
+        else:
+            end = end_match.start()
+        parser.feed(html_text[start:end])
+        pos = end
+
+
 def _discover_pagination_urls(html_text: str, page_url: str) -> list[str]:
     parser = _PaginationLinkParser()
-    parser.feed(html_text)
+    _feed_anchor_regions(parser, html_text)
     parser.close()
 
     base = urlsplit(page_url)
@@ -187,7 +282,7 @@ def _discover_pagination_urls(html_text: str, page_url: str) -> list[str]:
         href_lower = href.casefold()
         if href_lower.startswith(("javascript:", "mailto:", "tel:")):
             continue
-        absolute = urljoin(page_url, href)
+        absolute = _join_url(page_url, href)
         parsed = urlsplit(absolute)
         if parsed.scheme not in {"http", "https"}:
             continue
@@ -208,11 +303,47 @@ def _discover_pagination_urls(html_text: str, page_url: str) -> list[str]:
     return discovered
 
 
-def _collect_paginated_pages(start_url: str, *, limit: int = MAX_PAGINATION_PAGES) -> list[tuple[str, str]]:
+def _load_robots(url: str) -> RobotFileParser | None:
+    parsed = urlsplit(url)
+    robots_url = urlunsplit((parsed.scheme, parsed.netloc, "/robots.txt", "", ""))
+    parser = RobotFileParser(robots_url)
+    try:
+        robots_text = _fetch_with_urllib(robots_url)
+    except HTTPError as exc:
+        # Same rules as RobotFileParser.read(): an access-restricted
+        # robots.txt forbids everything, any other client error allows it.
+        if exc.code in (401, 403):
+            parser.disallow_all = True
+            return parser
+        return None
+    except (OSError, ValueError, LookupError):
+        # Missing, unreachable or undecodable robots.txt (a bogus declared
+        # charset raises LookupError) does not restrict crawling.
+        return None
+    parser.parse(robots_text.splitlines())
+    return parser
+
+
+def _robots_allows(url: str, cache: dict[str, RobotFileParser | None]) -> bool:
+    netloc = urlsplit(url).netloc.casefold()
+    if netloc not in cache:
+        cache[netloc] = _load_robots(url)
+    parser = cache[netloc]
+    return parser is None or parser.can_fetch(ROBOTS_USER_AGENT, url)
+
+
+def _iter_paginated_pages(
+    start_url: str,
+    *,
+    limit: int = MAX_PAGINATION_PAGES,
+    respect_robots: bool = False,
+) -> Iterator[tuple[str, str]]:
+    """Fetch *start_url* and its pagination pages, yielding each as it arrives."""
+
     queue: deque[str] = deque([start_url])
     queued: set[str] = {_normalize_url(start_url)}
     visited: set[str] = set()
-    pages: list[tuple[str, str]] = []
+    robots: dict[str, RobotFileParser | None] = {}
 
     while queue and len(visited) < limit:
         current = queue.popleft()
@@ -222,8 +353,8 @@ def _collect_paginated_pages(start_url: str, *, limit: int = MAX_PAGINATION_PAGE
             continue
 
         html_text = fetch(current)
-        pages.append((current, html_text))
         visited.add(normalized_current)
+        yield current, html_text
 
         if len(visited) >= limit:
             continue
@@ -234,31 +365,91 @@ def _collect_paginated_pages(start_url: str, *, limit: int = MAX_PAGINATION_PAGE
                 continue
             if len(visited) + len(queued) >= limit:
                 continue
+            if respect_robots and not _robots_allows(candidate, robots):
+                continue
             queue.append(candidate)
             queued.add(normalized_candidate)
 
-    return pages
 
+def scrape_site(
+    url: str, *, limit: int = MAX_PAGINATION_PAGES, respect_robots: bool = False
+) -> tuple[list[PriceResult], int]:
+    # Pages are fetched on this thread while the shared extraction pool
+    # processes the ones already downloaded, so the network wait for page N+1
+    # overlaps the CPU work on page N. Futures are consumed in submission
+    # order, which keeps the output identical to a sequential run.
+    # All Playwright fetches of the crawl share one browser launch.
+    with _playwright_session():
+        extractions = [
+            _EXTRACT_POOL.submit(extract_prices, html_text)
+            for _page_url, html_text in _iter_paginated_pages(
+                url, limit=limit, respect_robots=respect_robots
+            )
+        ]
 
-def scrape_site(url: str, *, limit: int = MAX_PAGINATION_PAGES) -> tuple[list[PriceResult], int]:
-    pages = _collect_paginated_pages(url, limit=limit)
-    results: list[PriceResult] = []
-    seen: set[tuple[str, str]] = set()
+    # Insertion-ordered dict: one hash lookup per item and the first
+    # occurrence of each (description, price) pair wins.
+    unique: dict[tuple[str, str], PriceResult] = {}
 
-    for _page_url, html_text in pages:
-        for item in extract_prices(html_text):
-            key = (item.description, item.price)
-            if key in seen:
-                continue
-            seen.add(key)
-            results.append(item)
+    for extraction in extractions:
+        for item in extraction.result():
+            unique.setdefault((item.description, item.price), item)
 
-    return results, len(pages)
+    return list(unique.values()), len(extractions)
+
+
+class _ScraperBusyError(Exception):
+    """Raised when every scrape slot is taken and the request must be shed."""
+
+
+class _ScrapeTimeoutError(Exception):
+    """Raised when waiting for a scrape job exceeds ``SCRAPE_TIMEOUT_SECONDS``."""
+
+
+# Scrapes run on a bounded worker pool; the semaphore caps running plus queued
+# jobs so a burst of requests is rejected instead of piling up threads.
+_SCRAPE_POOL = ThreadPoolExecutor(
+    max_workers=MAX_CONCURRENT_SCRAPES, thread_name_prefix="scrape"
+)
+# Price extraction for every running scrape shares one pool of the same size,
+# rather than each crawl starting and joining a thread of its own.
+_EXTRACT_POOL = ThreadPoolExecutor(
+    max_workers=MAX_CONCURRENT_SCRAPES, thread_name_prefix="extract"
+)
+_SCRAPE_SLOTS = BoundedSemaphore(MAX_PENDING_SCRAPES)
+
+
+def _run_scrape(url: str) -> tuple[list[PriceResult], int]:
+    if not _SCRAPE_SLOTS.acquire(blocking=False):
+        raise _ScraperBusyError("The scraper is busy right now, please try again shortly.")
+    try:
+        future = _SCRAPE_POOL.submit(scrape_site, url, respect_robots=True)
+    except BaseException:
+        _SCRAPE_SLOTS.release()
+        raise
+    # Release on completion rather than on return so a timed-out job keeps
+    # holding its slot until it actually stops running.
+    future.add_done_callback(lambda _future: _SCRAPE_SLOTS.release())
+    try:
+        return future.result(timeout=SCRAPE_TIMEOUT_SECONDS)
+    except FutureTimeoutError:
+        # On 3.11+ this is the builtin TimeoutError, which a socket read
+        # timeout inside the job also raises; only a wait that ran out while
+        # the job is still going is a scrape timeout.
+        if future.done():
+            raise
+        raise _ScrapeTimeoutError(
+            f"Scraping did not finish within {SCRAPE_TIMEOUT_SECONDS} seconds."
+        ) from None
+
+
+_SUMMARY_SINGULAR = "{products} products have been scrapped from 1 page"
+_SUMMARY_PLURAL = "{products} products have been scrapped from {pages} pages"
 
 
 def _format_summary(product_count: int, page_count: int) -> str:
-    page_word = "page" if page_count == 1 else "pages"
-    return f"{product_count} products have been scrapped from {page_count} {page_word}"
+    template = _SUMMARY_SINGULAR if page_count == 1 else _SUMMARY_PLURAL
+    return template.format(products=product_count, pages=page_count)
 
 
 def fetch(url: str) -> str:
@@ -271,7 +462,25 @@ def fetch(url: str) -> str:
     return _fetch_with_urllib(url)
 
 
+def _content_charset(content_type: str | None) -> str | None:
+    message = Message()
+    message["Content-Type"] = content_type or ""
+    return message.get_content_charset()
+
+
 def _fetch_with_urllib(url: str) -> str:
+    if _HTTP is not None:
+        try:
+            response = _HTTP.request("GET", url)
+        except urllib3.exceptions.HTTPError as exc:
+            raise URLError(f"Failed to fetch {url}: {exc}") from exc
+        if response.status >= 400:
+            raise HTTPError(url, response.status, response.reason, response.headers, None)
+        return response.data.decode(
+            _content_charset(response.headers.get("Content-Type")) or "utf-8",
+            errors="replace",
+        )
+
     request = Request(url, headers={"User-Agent": USER_AGENT})
     with urlopen(request, timeout=REQUEST_TIMEOUT_SECONDS) as response:  # nosec B310 - controlled URL
         return response.read().decode(
@@ -279,23 +488,96 @@ def _fetch_with_urllib(url: str) -> str:
         )
 
 
+class _PlaywrightSession:
+    """Browser shared by the Playwright fetches of a single crawl.
+
+    The browser is launched on the first fetch, so crawls that never reach
+    Playwright (or whose fetches are stubbed out) do not start one.
+    """
+
+    __slots__ = ("_manager", "_browser", "_context")
+
+    def __init__(self) -> None:
+        self._manager = None
+        self._browser = None
+        self._context = None
+
+    def new_page(self):
+        if self._context is None:
+            manager = sync_playwright()
+            playwright = manager.__enter__()
+            try:
+                browser = playwright.chromium.launch(headless=True)
+                context = browser.new_context(user_agent=USER_AGENT)
+            except BaseException:
+                manager.__exit__(*sys.exc_info())
+                raise
+            self._manager, self._browser, self._context = manager, browser, context
+        return self._context.new_page()
+
+    def close(self) -> None:
+        if self._context is None:
+            return
+        try:
+            self._context.close()
+            self._browser.close()
+        except (PlaywrightError, PlaywrightTimeoutError):
+            # Every page has been read by now; a failing shutdown must not
+            # discard the crawl's results.
+            pass
+        finally:
+            self._manager.__exit__(None, None, None)
+            self._manager = self._browser = self._context = None
+
+
+# Playwright's sync API is bound to the thread that started it, so each crawl
+# thread keeps its own session.
+_PLAYWRIGHT_LOCAL = local()
+
+
+@contextmanager
+def _playwright_session() -> Iterator[None]:
+    """Reuse one browser for every Playwright fetch made inside the block."""
+
+    if getattr(_PLAYWRIGHT_LOCAL, "session", None) is not None:
+        yield
+        return
+    session = _PlaywrightSession()
+    _PLAYWRIGHT_LOCAL.session = session
+    try:
+        yield
+    finally:
+        _PLAYWRIGHT_LOCAL.session = None
+        session.close()
+
+
+def _load_page_content(page, url: str) -> str:
+    page.set_default_timeout(REQUEST_TIMEOUT_MS)
+    page.goto(url, wait_until="domcontentloaded", timeout=REQUEST_TIMEOUT_MS)
+    try:
+        page.wait_for_load_state("networkidle", timeout=max(REQUEST_TIMEOUT_MS // 2, 1))
+    except PlaywrightTimeoutError:
+        pass
+    return page.content()
+
+
 def _fetch_with_playwright(url: str) -> str:
     assert sync_playwright is not None  # for type-checkers
 
+    session = getattr(_PLAYWRIGHT_LOCAL, "session", None)
+    if session is not None:
+        page = session.new_page()
+        try:
+            return _load_page_content(page, url)
+        finally:
+            page.close()
+
     with sync_playwright() as playwright:
         browser = playwright.chromium.launch(headless=True)
         context = browser.new_context(user_agent=USER_AGENT)
         page = context.new_page()
         try:
-            page.set_default_timeout(REQUEST_TIMEOUT_MS)
-            page.goto(url, wait_until="domcontentloaded", timeout=REQUEST_TIMEOUT_MS)
-            try:
-                page.wait_for_load_state(
-                    "networkidle", timeout=max(REQUEST_TIMEOUT_MS // 2, 1)
-                )
-            except PlaywrightTimeoutError:
-                pass
-            html_content = page.content()
+            html_content = _load_page_content(page, url)
         finally:
             context.close()
             browser.close()
@@ -313,29 +595,17 @@ def validate_url(value: str) -> str:
     return parsed.geturl()
 
 
-def render_page(
-    url: str = "",
-    error: str | None = None,
-    results: list[PriceResult] | None = None,
-    summary: str | None = None,
-) -> bytes:
-    rows = ""
-    if results:
-        for item in results:
-            rows += (
-                "<tr><td>{description}</td><td>{price}</td><td>{availability}</td></tr>".format(
-                    description=html.escape(item.description),
-                    price=html.escape(item.price),
-                    availability=html.escape(item.availability) if item.availability else "",
-                )
-            )
-    elif results is not None:
-        rows = '<tr><td colspan="3">No prices were detected on the page.</td></tr>'
+def _extract_url_param(query: str) -> str:
+    """Return the first non-empty ``url`` value from a form-encoded *query*."""
+
+    for pair in query.split("&"):
+        key, _, value = pair.partition("=")
+        if value and unquote_plus(key) == "url":
+            return unquote_plus(value)
+    return ""
 
-    error_html = f'<div class="error">{html.escape(error)}</div>' if error else ""
-    summary_html = f'<p class="summary">{html.escape(summary)}</p>' if summary else ""
 
-    page = f"""
+_PAGE_TEMPLATE = b"""
     <!doctype html>
     <html lang="en">
       <head>
@@ -343,117 +613,144 @@ def render_page(
         <meta name="viewport" content="width=device-width, initial-scale=1">
         <title>Pricing Scraper</title>
         <style>
-          body {{
+          body {
             font-family: system-ui, -apple-system, BlinkMacSystemFont, 'Segoe UI', sans-serif;
             max-width: 900px;
             margin: 2rem auto;
             padding: 0 1.5rem;
             line-height: 1.5;
-          }}
-          form {{
+          }
+          form {
             display: flex;
             gap: 0.5rem;
             flex-wrap: wrap;
             margin-bottom: 1.5rem;
-          }}
-          input[type=url] {{
+          }
+          input[type=url] {
             flex: 1 1 300px;
             padding: 0.6rem;
             font-size: 1rem;
-          }}
-          button {{
+          }
+          button {
             padding: 0.6rem 1.2rem;
             font-size: 1rem;
             cursor: pointer;
-          }}
-          table {{
-            width: 100%;
+          }
+          table {
+            width: 100%%;
             border-collapse: collapse;
-          }}
-          th, td {{
+          }
+          th, td {
             border-bottom: 1px solid #ccc;
             padding: 0.75rem;
             text-align: left;
-          }}
-          th {{
+          }
+          th {
             background-color: rgba(0, 0, 0, 0.05);
-          }}
-          tbody tr:nth-child(even) td {{
+          }
+          tbody tr:nth-child(even) td {
             background-color: rgba(0, 0, 0, 0.03);
-          }}
-          .error {{
+          }
+          .error {
             color: #d32f2f;
             margin-bottom: 1rem;
-          }}
-          .summary {{
+          }
+          .summary {
             font-weight: 600;
             margin-bottom: 0.75rem;
-          }}
+          }
         </style>
       </head>
       <body>
         <h1>Pricing Scraper</h1>
         <p>Paste the URL of a page that contains products with prices. The scraper will attempt to detect them and list the results.</p>
         <form method="post">
-          <input type="url" name="url" value="{html.escape(url)}" placeholder="https://example.com/products" required>
+          <input type="url" name="url" value="%(url)b" placeholder="https://example.com/products" required>
           <button type="submit">Scrape</button>
         </form>
-        {error_html}
-        {summary_html}
+        %(error)b
+        %(summary)b
         <table>
           <thead>
             <tr><th>Description</th><th>Price</th><th>Availability</th></tr>
           </thead>
           <tbody>
-            {rows}
+            %(rows)b
           </tbody>
         </table>
       </body>
     </html>
     """
-    return page.encode("utf-8")
+
+
+def render_page(
+    url: str = "",
+    error: str | None = None,
+    results: list[PriceResult] | None = None,
+    summary: str | None = None,
+) -> bytes:
+    rows = ""
+    if results:
+        rows = "".join(
+            "<tr><td>{description}</td><td>{price}</td><td>{availability}</td></tr>".format(
+                description=html.escape(item.description),
+                price=html.escape(item.price),
+                availability=html.escape(item.availability) if item.availability else "",
+            )
+            for item in results
+        )
+    elif results is not None:
+        rows = '<tr><td colspan="3">No prices were detected on the page.</td></tr>'
+
+    error_html = f'<div class="error">{html.escape(error)}</div>' if error else ""
+    summary_html = f'<p class="summary">{html.escape(summary)}</p>' if summary else ""
+
+    # Only the dynamic fragments are encoded; the static markup is already bytes.
+    return _PAGE_TEMPLATE % {
+        b"url": html.escape(url).encode("utf-8"),
+        b"error": error_html.encode("utf-8"),
+        b"summary": summary_html.encode("utf-8"),
+        b"rows": rows.encode("utf-8"),
+    }
 
 
 class ScraperHandler(BaseHTTPRequestHandler):
-    def do_GET(self) -> None:  # noqa: N802 - method name required by BaseHTTPRequestHandler
-        query = parse_qs(self._parsed_path.query)
-        url = query.get("url", [""])[0]
-        results = None
-        error = None
-        summary = None
-        if url:
-            try:
-                validated = validate_url(url)
-                results, page_count = scrape_site(validated)
-                summary = _format_summary(len(results), page_count)
-            except (ValueError, URLError, HTTPError) as exc:
-                error = str(exc)
+    # Keep connections open between requests; every response sets
+    # Content-Length so clients can tell where a body ends.
+    protocol_version = "HTTP/1.1"
 
-        body = render_page(url=url, error=error, results=results, summary=summary)
-        self._send_response(body)
+    def do_GET(self) -> None:  # noqa: N802 - method name required by BaseHTTPRequestHandler
+        url = _extract_url_param(self._parsed_path.query)
+        self._handle_scrape(url)
 
     def do_POST(self) -> None:  # noqa: N802
         length = int(self.headers.get("Content-Length", 0))
         data = self.rfile.read(length).decode("utf-8") if length else ""
-        params = parse_qs(data)
-        url = params.get("url", [""])[0]
+        url = _extract_url_param(data)
+        self._handle_scrape(url)
 
-        error = None
+    def _handle_scrape(self, url: str) -> None:
+        status = HTTPStatus.OK
         results = None
+        error = None
         summary = None
         if url:
             try:
                 validated = validate_url(url)
-                results, page_count = scrape_site(validated)
+                results, page_count = _run_scrape(validated)
                 summary = _format_summary(len(results), page_count)
-            except (ValueError, URLError, HTTPError) as exc:
+            except _ScraperBusyError as exc:
+                status = HTTPStatus.SERVICE_UNAVAILABLE
                 error = str(exc)
+            except (_ScrapeTimeoutError, ValueError, OSError) as exc:
+                # URLError, HTTPError and socket timeouts are all OSErrors.
+                error = str(exc) or type(exc).__name__
 
         body = render_page(url=url, error=error, results=results, summary=summary)
-        self._send_response(body)
+        self._send_response(body, status)
 
-    def _send_response(self, body: bytes) -> None:
-        self.send_response(HTTPStatus.OK)
+    def _send_response(self, body: bytes, status: HTTPStatus = HTTPStatus.OK) -> None:
+        self.send_response(status)
         self.send_header("Content-Type", "text/html; charset=utf-8")
         self.send_header("Content-Length", str(len(body)))
         self.end_headers()
@@ -478,6 +775,8 @@ def run(host: str = "0.0.0.0", port: int = 8000) -> None:
         pass
     finally:
         server.server_close()
+        _SCRAPE_POOL.shutdown(wait=False, cancel_futures=True)
+        _EXTRACT_POOL.shutdown(wait=False, cancel_futures=True)
 
 
 def main() -> None:
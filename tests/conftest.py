@@ -0,0 +1,25 @@
+"""Shared pytest fixtures."""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+
+@pytest.fixture
+def server():
+    """Return the ``server`` module, imported once per test session.
+
+    Tests patch module state through ``monkeypatch``, which restores it
+    afterwards, so the module never needs to be reloaded between tests.
+    """
+
+    import server as server_module
+
+    return server_module
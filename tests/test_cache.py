@@ -0,0 +1,71 @@
+"""Tests for the on-disk page cache."""
+
+from __future__ import annotations
+
+import os
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from pricing_scrapper.cache import DiskCache
+from pricing_scrapper.knbk import Category, Product, scrape_category_products
+
+
+def test_get_or_fetch_reuses_cached_page(tmp_path):
+    cache = DiskCache(tmp_path)
+    fetched: list[str] = []
+
+    def fake_fetch(url: str) -> str:
+        fetched.append(url)
+        return "<html>ціна</html>"
+
+    assert cache.get_or_fetch("https://example.com/a", fake_fetch) == "<html>ціна</html>"
+    assert cache.get_or_fetch("https://example.com/a", fake_fetch) == "<html>ціна</html>"
+    assert fetched == ["https://example.com/a"]
+    assert cache.get("https://example.com/b") is None
+
+
+def test_stale_entries_are_refetched(tmp_path):
+    cache = DiskCache(tmp_path, ttl_seconds=60)
+    cache.put("https://example.com/a", "old")
+
+    path = cache._path("https://example.com/a")
+    stale = path.stat().st_mtime - 120
+    os.utime(path, (stale, stale))
+
+    assert cache.get("https://example.com/a") is None
+    assert cache.get_or_fetch("https://example.com/a", lambda url: "new") == "new"
+    assert cache.get("https://example.com/a") == "new"
+
+
+def test_scrape_category_products_uses_cache(tmp_path):
+    page = """
+    <section class="b-products-group">
+      <h2 class="b-products-group__title">Турки</h2>
+      <div class="b-product-gallery__item">
+        <a class="b-product-gallery__title" href="/t1">Турка 1</a>
+        <span class="b-goods-price__value">300 ₴</span>
+      </div>
+    </section>
+    """
+    fetched: list[str] = []
+
+    def fake_fetch(url: str) -> str:
+        fetched.append(url)
+        return page
+
+    cache = DiskCache(tmp_path)
+    expected = [
+        Category(name="Турки", products=[Product(name="Турка 1", price="300 ₴", url="/t1")])
+    ]
+
+    for _ in range(2):
+        categories = scrape_category_products(
+            "https://example.com/cat/", fetch=fake_fetch, cache=cache
+        )
+        assert categories == expected
+
+    assert fetched == ["https://example.com/cat/"]
@@ -0,0 +1,79 @@
+"""Tests for the JSON catalog writers."""
+
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from pricing_scrapper import export
+from pricing_scrapper.knbk import Category, Product
+
+
+CATEGORIES = [
+    Category(
+        name="Кавомолки",
+        products=[
+            Product(name="Кавомолка 1", price="1 675 ₴", url="/p1"),
+            Product(name="Кавомолка 2"),
+        ],
+    ),
+    Category(name="Фільтри", products=[Product(name="Фільтр", price="99 ₴")]),
+]
+
+
+def test_dump_catalog_writes_json_array(tmp_path, monkeypatch):
+    path = tmp_path / "catalog.json"
+    export.dump_catalog(CATEGORIES, path)
+
+    monkeypatch.setattr(export, "orjson", None)
+    fallback_path = tmp_path / "fallback.json"
+    export.dump_catalog(CATEGORIES, fallback_path)
+
+    assert path.read_bytes() == fallback_path.read_bytes()
+    assert json.loads(path.read_text(encoding="utf-8")) == [
+        {
+            "name": "Кавомолки",
+            "products": [
+                {"name": "Кавомолка 1", "price": "1 675 ₴", "url": "/p1"},
+                {"name": "Кавомолка 2", "price": None, "url": None},
+            ],
+        },
+        {
+            "name": "Фільтри",
+            "products": [{"name": "Фільтр", "price": "99 ₴", "url": None}],
+        },
+    ]
+
+
+def test_dump_products_jsonl_matches_with_and_without_orjson(tmp_path, monkeypatch):
+    items = [
+        (category.name, product)
+        for category in CATEGORIES
+        for product in category.products
+    ]
+
+    first = tmp_path / "first.jsonl"
+    assert export.dump_products_jsonl(iter(items), first) == 3
+
+    monkeypatch.setattr(export, "orjson", None)
+    second = tmp_path / "second.jsonl"
+    assert export.dump_products_jsonl(iter(items), second) == 3
+
+    assert first.read_bytes() == second.read_bytes()
+    lines = first.read_text(encoding="utf-8").splitlines()
+    assert json.loads(lines[0]) == {
+        "category": "Кавомолки",
+        "name": "Кавомолка 1",
+        "price": "1 675 ₴",
+        "url": "/p1",
+    }
+    assert [json.loads(line)["category"] for line in lines] == [
+        "Кавомолки",
+        "Кавомолки",
+        "Фільтри",
+    ]
@@ -5,6 +5,8 @@ from __future__ import annotations
 import sys
 from pathlib import Path
 
+import pytest
+
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
@@ -12,7 +14,9 @@ if str(ROOT) not in sys.path:
 from pricing_scrapper.knbk import (
     Category,
     Product,
+    iter_category_products,
     parse_category_products,
+    parse_category_products_stream,
     scrape_category_products,
 )
 
@@ -120,7 +124,169 @@ def test_parse_category_products_generates_placeholder_when_missing_title():
     assert categories[0].products == [Product(name="Test product", price="1 111 ₴", url="/p111")]
 
 
+@pytest.fixture
+def reset_parser_backend():
+    from pricing_scrapper import knbk
+
+    knbk._parser_backend.cache_clear()
+    yield
+    knbk._parser_backend.cache_clear()
+
+
+def test_parse_category_products_backends_agree(monkeypatch):
+    from pricing_scrapper import knbk
+
+    if knbk.etree is None:
+        pytest.skip("lxml is not installed")
+
+    html = """
+    <section class="b-products-group" data-qaid="catalog_group">
+        <h2 class="b-products-group__title">Турки &amp; джезви</h2>
+        <!-- promo block -->
+        <div class="b-products-group__body">
+            <div class="b-product-gallery__item">
+                <a class="b-product-gallery__title" href="/t1">Турка <b>мідна</b></a>
+                <span class="b-goods-price__value">450&nbsp;₴</span>
+            </div>
+        </div>
+    </section>
+    """
+
+    with_lxml = parse_category_products(html)
+    monkeypatch.setattr(knbk, "etree", None)
+    with_stdlib = parse_category_products(html)
+
+    assert with_lxml == with_stdlib == [
+        Category(
+            name="Турки & джезви",
+            products=[Product(name="Турка мідна", price="450 ₴", url="/t1")],
+        )
+    ]
+
+
+def test_knbk_parser_env_var_selects_backend(monkeypatch, reset_parser_backend):
+    from pricing_scrapper import knbk
+
+    monkeypatch.setenv("KNBK_PARSER", "html.parser")
+    assert isinstance(knbk._make_event_parser(knbk._KNBKPageBuilder()), knbk._KNBKPageParser)
+
+    # The value is read once; later changes need the cache to be cleared.
+    monkeypatch.setenv("KNBK_PARSER", "lexbor")
+    assert knbk._parser_backend() == "html.parser"
+
+    knbk._parser_backend.cache_clear()
+    with pytest.raises(ValueError, match="KNBK_PARSER"):
+        parse_category_products("<div></div>")
+
+
+def test_parse_category_products_recovers_from_malformed_markup(
+    monkeypatch, reset_parser_backend
+):
+    from pricing_scrapper import knbk
+
+    if knbk.etree is None:
+        pytest.skip("lxml is not installed")
+    monkeypatch.delenv("KNBK_PARSER", raising=False)
+
+    html = """
+    <section class="b-products-group" data-qaid="catalog_group">
+      <h2 class="b-products-group__title">Кавомолки</h2></span>
+      <div class="b-products-group__body">
+        <div class="b-product-gallery__item">
+          <img src="/1.jpg" alt="">
+          <a class="b-product-gallery__title" href="/p1">Кавомолка 1</a>
+          <span class="b-goods-price__value">100 ₴
+        </div>
+        <div class="b-product-gallery__item">
+          <br>
+          <a class="b-product-gallery__title" href="/p2">Кавомолка 2</a>
+          <span class="b-goods-price__value">200 ₴</span>
+      </div>
+    </section>
+    """
+
+    assert parse_category_products(html) == [
+        Category(
+            name="Кавомолки",
+            products=[
+                Product(name="Кавомолка 1", price="100 ₴", url="/p1"),
+                Product(name="Кавомолка 2", price="200 ₴", url="/p2"),
+            ],
+        )
+    ]
+
+
+def test_parse_category_products_stream_yields_groups_as_they_close():
+    groups = [
+        """
+        <div class="b-products-group" data-qaid="catalog_group">
+            <div class="b-product-gallery__item">
+                <a class="b-product-gallery__title" href="/p%d">Product %d</a>
+                <span class="b-goods-price__value">%d ₴</span>
+            </div>
+        </div>
+        """
+        % (index, index, index * 100)
+        for index in (1, 2)
+    ]
+    consumed = []
+
+    def chunks():
+        for index, group in enumerate(groups):
+            consumed.append(index)
+            # Split mid-tag to exercise the incremental tokenizer.
+            middle = len(group) // 2
+            yield group[:middle]
+            yield group[middle:]
+        consumed.append("end")
+        yield "<footer></footer>"
+
+    stream = parse_category_products_stream(chunks())
+    first = next(stream)
+
+    assert first == Category(
+        name="Category 1",
+        products=[Product(name="Product 1", price="100 ₴", url="/p1")],
+    )
+    assert "end" not in consumed
+    assert list(stream) == [
+        Category(
+            name="Category 2",
+            products=[Product(name="Product 2", price="200 ₴", url="/p2")],
+        )
+    ]
+    assert list(parse_category_products_stream([])) == []
+
+
+def test_iter_category_products_flattens_groups_in_order():
+    html = """
+    <section class="b-products-group">
+        <h2 class="b-products-group__title">Кавомолки</h2>
+        <div class="b-product-gallery__item">
+            <a class="b-product-gallery__title" href="/p1">Кавомолка 1</a>
+        </div>
+        <div class="b-product-gallery__item">
+            <a class="b-product-gallery__title" href="/p2">Кавомолка 2</a>
+            <span class="b-goods-price__value">200 ₴</span>
+        </div>
+    </section>
+    <section class="b-products-group">
+        <div class="b-product-gallery__item">
+            <a class="b-product-gallery__title" href="/p3">Фільтр</a>
+        </div>
+    </section>
+    """
+
+    assert list(iter_category_products(html)) == [
+        ("Кавомолки", Product(name="Кавомолка 1", price=None, url="/p1")),
+        ("Кавомолки", Product(name="Кавомолка 2", price="200 ₴", url="/p2")),
+        ("Category 2", Product(name="Фільтр", price=None, url="/p3")),
+    ]
+
+
 def test_scrape_category_products_follows_pagination():
+    import threading
+
     page_1 = """
     <html>
       <body>
@@ -199,13 +365,17 @@ def test_scrape_category_products_follows_pagination():
     }
 
     visited: list[str] = []
+    fetch_threads: set[str] = set()
 
     def fake_fetch(url: str) -> str:
         visited.append(url)
+        fetch_threads.add(threading.current_thread().name)
         return pages[url]
 
     categories = scrape_category_products("https://example.com/cat/", fetch=fake_fetch)
 
+    # Without prefetch=True every fetch stays on the calling thread.
+    assert fetch_threads == {threading.current_thread().name}
     assert visited == [
         "https://example.com/cat/",
         "https://example.com/cat/?page=2",
@@ -230,6 +400,132 @@ def test_scrape_category_products_follows_pagination():
     ]
 
 
+@pytest.mark.parametrize(
+    ("head", "footer"),
+    [
+        ('<link rel="next" href="?page=2">', ""),
+        ("", '<a class="pager__next" href="?page=2">›</a>'),
+    ],
+    ids=["link-in-head", "link-at-bottom"],
+)
+def test_scrape_category_products_prefetches_next_page(monkeypatch, head, footer):
+    import threading
+
+    from pricing_scrapper import knbk
+
+    page_1 = f"""
+    <html>
+      <head>{head}</head>
+      <body>
+        <section class="b-products-group">
+          <h2 class="b-products-group__title">Фільтри</h2>
+          <div class="b-product-gallery__item">
+            <a class="b-product-gallery__title" href="/f1">Фільтр 1</a>
+            <span class="b-goods-price__value">90 ₴</span>
+          </div>
+        </section>
+        {footer}
+      </body>
+    </html>
+    """
+    page_2 = """
+    <section class="b-products-group">
+      <h2 class="b-products-group__title">Фільтри</h2>
+      <div class="b-product-gallery__item">
+        <a class="b-product-gallery__title" href="/f2">Фільтр 2</a>
+        <span class="b-goods-price__value">95 ₴</span>
+      </div>
+    </section>
+    """
+    pages = {
+        "https://example.com/f/": page_1,
+        "https://example.com/f/?page=2": page_2,
+    }
+
+    page_2_requested = threading.Event()
+
+    def fake_fetch(url: str) -> str:
+        if url.endswith("?page=2"):
+            page_2_requested.set()
+        return pages[url]
+
+    original_start = knbk._KNBKPageBuilder.start
+    overlapped: list[bool] = []
+
+    def observing_start(self, tag, attrs):
+        if attrs.get("href") == "/f1":
+            overlapped.append(page_2_requested.wait(timeout=5))
+        return original_start(self, tag, attrs)
+
+    monkeypatch.setattr(knbk, "_FEED_CHUNK_SIZE", 64)
+    monkeypatch.setattr(knbk._KNBKPageBuilder, "start", observing_start)
+
+    categories = scrape_category_products(
+        "https://example.com/f/", fetch=fake_fetch, prefetch=True
+    )
+
+    assert overlapped == [True]
+    assert categories == [
+        Category(
+            name="Фільтри",
+            products=[
+                Product(name="Фільтр 1", price="90 ₴", url="/f1"),
+                Product(name="Фільтр 2", price="95 ₴", url="/f2"),
+            ],
+        )
+    ]
+
+
+def test_prescan_next_href_stops_unclosed_anchors_at_the_next_link():
+    from pricing_scrapper import knbk
+
+    items = "".join(f'<li><a href="/p{i}">Товар {i}</li>' for i in range(200))
+    html_text = f'<ul>{items}</ul><a class="pager__next" href="?page=2">›</a>'
+
+    assert knbk._prescan_next_href(html_text) == "?page=2"
+    # Each unclosed anchor's match ends before the following anchor opens,
+    # instead of scanning on to the end of the page.
+    matches = list(knbk._NEXT_LINK_SCAN_RE.finditer(html_text))
+    assert len(matches) == 201
+    assert all("<a" not in match.group()[2:] for match in matches)
+
+
+def test_scrape_category_products_does_not_wait_for_unconfirmed_prefetch(monkeypatch):
+    import threading
+
+    from pricing_scrapper import knbk
+
+    page = """
+    <section class="b-products-group">
+      <h2 class="b-products-group__title">Фільтри</h2>
+      <div class="b-product-gallery__item">
+        <a class="b-product-gallery__title" href="/f1">Фільтр 1</a>
+      </div>
+    </section>
+    """
+    release = threading.Event()
+    hint_fetched = threading.Event()
+
+    def fake_fetch(url: str) -> str:
+        if url.endswith("?page=9"):
+            release.wait(timeout=5)
+            hint_fetched.set()
+        return page
+
+    # A prescan hint the full parse does not confirm.
+    monkeypatch.setattr(knbk, "_prescan_next_href", lambda html_text: "?page=9")
+
+    try:
+        categories = scrape_category_products(
+            "https://example.com/f/", fetch=fake_fetch, prefetch=True
+        )
+        assert not hint_fetched.is_set()
+    finally:
+        release.set()
+
+    assert [product.url for product in categories[0].products] == ["/f1"]
+
+
 def test_scrape_category_products_uses_data_url_when_href_placeholder():
     page_1 = """
     <html>
@@ -4,6 +4,8 @@ import html
 import sys
 from pathlib import Path
 
+import pytest
+
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
@@ -11,20 +13,25 @@ if str(ROOT) not in sys.path:
 from pricing_scrapper.scraper import PRICE_PATTERN, PriceResult, extract_prices, iter_prices
 
 
-def test_price_pattern_matches_common_formats():
-    samples = [
-        "$19.99",
-        "€99,95",
-        "GBP 12.00",
-        "1,299.00 USD",
-        "1 200 ₴",
-        html.unescape("1&nbsp;200 ₴"),
-        html.unescape("2&#160;500 USD"),
-    ]
-    for sample in samples:
-        match = PRICE_PATTERN.search(sample)
-        assert match
-        assert match.group() == sample
+NBSP_UAH_PRICE = html.unescape("1&nbsp;200 ₴")
+NBSP_USD_PRICE = html.unescape("2&#160;500 USD")
+
+PRICE_SAMPLES = [
+    "$19.99",
+    "€99,95",
+    "GBP 12.00",
+    "1,299.00 USD",
+    "1 200 ₴",
+    NBSP_UAH_PRICE,
+    NBSP_USD_PRICE,
+]
+
+
+@pytest.mark.parametrize("sample", PRICE_SAMPLES)
+def test_price_pattern_matches_common_formats(sample):
+    match = PRICE_PATTERN.search(sample)
+    assert match
+    assert match.group() == sample
 
 
 def test_iter_prices_yields_matches():
@@ -38,8 +45,8 @@ def test_iter_prices_yields_matches():
     assert prices == [
         "$12.50",
         "€9,99",
-        html.unescape("1&nbsp;200 ₴"),
-        html.unescape("2&#160;500 USD"),
+        NBSP_UAH_PRICE,
+        NBSP_USD_PRICE,
     ]
 
 
@@ -59,8 +66,8 @@ def test_extract_prices_returns_snippets():
     assert [r.price for r in results] == [
         "$12.50",
         "€9,99",
-        html.unescape("1&nbsp;200 ₴"),
-        html.unescape("2&#160;500 USD"),
+        NBSP_UAH_PRICE,
+        NBSP_USD_PRICE,
     ]
     assert all(isinstance(result, PriceResult) for result in results)
     assert any("Widget A" in result.description for result in results)
@@ -201,3 +208,106 @@ def test_extract_prices_skips_attribute_only_matches():
     assert results
     assert [result.price for result in results] == ["1 675 ₴"]
     assert results[0].description == "Кавомолка Hario Skerton Plus"
+
+
+def _rfind_inside_tag(text: str, index: int) -> bool:
+    # The stateless check _TagTracker replaced; the tracker must agree with it.
+    lt_index = text.rfind("<", 0, index)
+    return lt_index != -1 and text.rfind(">", 0, index) < lt_index
+
+
+@pytest.mark.parametrize(
+    ("text", "needle", "inside"),
+    [
+        # A quoted ">" ends the tag as far as the check is concerned, exactly
+        # like the rfind version; such matches rely on later filtering.
+        ('<a title="a > b" data-price="$5">x</a>', "$5", False),
+        ('<div data-price="$5">', "$5", True),
+        ("<div class='card' data-price='$5", "$5", True),
+        ("price $5 <", "$5", False),
+        ("price > $5", "$5", False),
+    ],
+)
+def test_tag_tracker_matches_rfind_check(text, needle, inside):
+    from pricing_scrapper import scraper
+
+    index = text.index(needle)
+
+    assert scraper._TagTracker(text).inside(index) is inside
+    assert _rfind_inside_tag(text, index) is inside
+
+
+def test_tag_tracker_handles_repeated_and_decreasing_offsets():
+    from pricing_scrapper import scraper
+
+    text = '<p class="a">$1</p> $2 <span data-x="$3">$4</span><b'
+    offsets = [0, 5, 5, 14, 14, 3, 20, len(text), 12, 40, 40, 1, len(text)]
+    tracker = scraper._TagTracker(text)
+
+    assert [tracker.inside(offset) for offset in offsets] == [
+        _rfind_inside_tag(text, offset) for offset in offsets
+    ]
+
+
+AVAILABILITY_PHRASES = [
+    "Немає в наявності",
+    "НЕМАЄ В НАЯВНОСТІ",
+    "нема на складі",
+    "Нет в наличии",
+    "НЕТ НА СКЛАДE",
+    "Наявність: немає",
+    "наличие: НЕТ",
+    "Товар відсутній",
+    "ОТСУТСТВУЕТ",
+    "Закінчився",
+    "Під замовлення",
+    "ПОД ЗАКАЗ",
+    "Очікується",
+    "Sold Out",
+    "SOLDOUT",
+    "Out Of Stock",
+    "В наявності",
+    "є у наявності",
+    "Наявність: Є",
+    "наявнiсть: є",
+    "НАЛИЧИЕ: ЕСТЬ",
+    "Є на складі",
+    "есть на складe",
+    "В НАЛИЧИИ",
+    "ГОТОВО ДО ВІДПРАВКИ",
+    "Готов к отправке",
+    "Ціна 1 675 ₴",
+    "",
+]
+
+
+@pytest.mark.parametrize("phrase", AVAILABILITY_PHRASES)
+def test_availability_stem_prefilter_never_hides_a_match(phrase):
+    from pricing_scrapper import scraper
+
+    def without_prefilter(text, patterns):
+        for pattern, label in patterns:
+            match = pattern.search(text)
+            if match:
+                matched = label if label is not None else match.group(0)
+                return scraper._normalize_availability_value(matched)
+        return None
+
+    marker_lists = [
+        (scraper._AVAILABILITY_OUT_OF_STOCK_MARKERS, scraper._AVAILABILITY_OUT_OF_STOCK_STEMS),
+        (scraper._AVAILABILITY_IN_STOCK_MARKERS, scraper._AVAILABILITY_IN_STOCK_STEMS),
+    ]
+    variants = {
+        phrase,
+        phrase.lower(),
+        phrase.upper(),
+        phrase.title(),
+        phrase.swapcase(),
+        f"Кавомолка — {phrase.swapcase()}!",
+    }
+
+    for text in variants:
+        for patterns, stems in marker_lists:
+            assert scraper._match_availability_patterns(
+                text, patterns, stems
+            ) == without_prefilter(text, patterns)
@@ -5,11 +5,7 @@ from urllib.error import URLError
 import pytest
 
 
-def test_fetch_uses_stdlib_when_playwright_missing(monkeypatch):
-    import importlib
-
-    server = importlib.import_module("server")
-
+def test_fetch_uses_stdlib_when_playwright_missing(server, monkeypatch):
     monkeypatch.setattr(server, "sync_playwright", None)
 
     def fake_fetch(url: str) -> str:
@@ -21,11 +17,7 @@ def test_fetch_uses_stdlib_when_playwright_missing(monkeypatch):
     assert server.fetch("https://example.com") == "<html></html>"
 
 
-def test_fetch_wraps_playwright_errors(monkeypatch):
-    import importlib
-
-    server = importlib.import_module("server")
-
+def test_fetch_wraps_playwright_errors(server, monkeypatch):
     class DummyError(Exception):
         pass
 
@@ -44,11 +36,33 @@ def test_fetch_wraps_playwright_errors(monkeypatch):
     assert "Playwright failed to fetch" in str(exc.value)
 
 
-def test_playwright_timeout_fallback(monkeypatch):
-    import importlib
+def test_fetch_with_urllib_uses_shared_pool(server, monkeypatch):
+    class DummyResponse:
+        status = 200
+        reason = "OK"
+        headers = {"Content-Type": "text/html; charset=windows-1251"}
+        data = "<html>ціна</html>".encode("windows-1251")
+
+    class DummyPool:
+        def __init__(self):
+            self.calls = []
+
+        def request(self, method, url):
+            self.calls.append((method, url))
+            return DummyResponse()
+
+    pool = DummyPool()
+    monkeypatch.setattr(server, "_HTTP", pool)
+
+    assert server._fetch_with_urllib("https://example.com/a") == "<html>ціна</html>"
+    assert server._fetch_with_urllib("https://example.com/b") == "<html>ціна</html>"
+    assert pool.calls == [
+        ("GET", "https://example.com/a"),
+        ("GET", "https://example.com/b"),
+    ]
 
-    server = importlib.reload(importlib.import_module("server"))
 
+def test_playwright_timeout_fallback(server, monkeypatch):
     class DummyTimeout(Exception):
         pass
 
@@ -139,11 +153,86 @@ def test_playwright_timeout_fallback(monkeypatch):
     ]
 
 
-def test_scrape_site_follows_pagination(monkeypatch):
-    import importlib
+def test_scrape_site_reuses_playwright_browser(server, monkeypatch):
+    pages = {
+        "https://example.com/products": (
+            "<span>$10.00</span><a href='/products?page=2' class='next'>Next</a>"
+        ),
+        "https://example.com/products?page=2": "<span>$12.50</span>",
+    }
+    events: list[str] = []
 
-    server = importlib.reload(importlib.import_module("server"))
+    class DummyPage:
+        def __init__(self):
+            self.url = None
+
+        def set_default_timeout(self, value):
+            pass
+
+        def goto(self, url, wait_until, timeout):
+            self.url = url
 
+        def wait_for_load_state(self, state, timeout):
+            pass
+
+        def content(self):
+            return pages[self.url]
+
+        def close(self):
+            events.append("page.close")
+
+    class DummyContext:
+        def new_page(self):
+            events.append("new_page")
+            return DummyPage()
+
+        def close(self):
+            events.append("context.close")
+
+    class DummyBrowser:
+        def new_context(self, user_agent):
+            return DummyContext()
+
+        def close(self):
+            events.append("browser.close")
+
+    class DummyChromium:
+        def launch(self, headless):
+            events.append("launch")
+            return DummyBrowser()
+
+    class DummyPlaywright:
+        chromium = DummyChromium()
+
+    class DummyManager:
+        def __enter__(self):
+            events.append("enter")
+            return DummyPlaywright()
+
+        def __exit__(self, exc_type, exc, tb):
+            events.append("exit")
+            return False
+
+    monkeypatch.setattr(server, "sync_playwright", DummyManager)
+
+    results, page_count = server.scrape_site("https://example.com/products")
+
+    assert page_count == 2
+    assert [item.price for item in results] == ["$10.00", "$12.50"]
+    assert events == [
+        "enter",
+        "launch",
+        "new_page",
+        "page.close",
+        "new_page",
+        "page.close",
+        "context.close",
+        "browser.close",
+        "exit",
+    ]
+
+
+def test_scrape_site_follows_pagination(server, monkeypatch):
     pages = {
         "https://example.com/products": """
             <html>
@@ -188,11 +277,48 @@ def test_scrape_site_follows_pagination(monkeypatch):
     ]
 
 
-def test_scrape_site_without_pagination(monkeypatch):
-    import importlib
+def test_scrape_site_extracts_while_fetching_next_page(server, monkeypatch):
+    import threading
 
-    server = importlib.reload(importlib.import_module("server"))
+    from pricing_scrapper.scraper import PriceResult
 
+    pages = {
+        "https://example.com/products": (
+            "<span>$10.00</span><a href='/products?page=2' class='next'>Next</a>"
+        ),
+        "https://example.com/products?page=2": "<span>$12.50</span>",
+    }
+    first_page_extracted = threading.Event()
+    overlapped: list[bool] = []
+    extract_threads: list[str] = []
+
+    def fake_fetch(url: str) -> str:
+        if url.endswith("page=2"):
+            # Only returns promptly if page 1 is extracted in the background.
+            overlapped.append(first_page_extracted.wait(timeout=5))
+        return pages[url]
+
+    def fake_extract_prices(html_text: str) -> list[PriceResult]:
+        extract_threads.append(threading.current_thread().name)
+        price = "$10.00" if "$10.00" in html_text else "$12.50"
+        if price == "$10.00":
+            first_page_extracted.set()
+        return [PriceResult(description=f"Item {price}", price=price)]
+
+    monkeypatch.setattr(server, "fetch", fake_fetch)
+    monkeypatch.setattr(server, "extract_prices", fake_extract_prices)
+    # Extraction runs on the shared module-level pool, not one built per crawl.
+    monkeypatch.setattr(server, "ThreadPoolExecutor", None)
+
+    results, page_count = server.scrape_site("https://example.com/products")
+
+    assert page_count == 2
+    assert overlapped == [True]
+    assert [item.price for item in results] == ["$10.00", "$12.50"]
+    assert all(name.startswith("extract") for name in extract_threads)
+
+
+def test_scrape_site_without_pagination(server, monkeypatch):
     pages = {
         "https://example.com/products": """
             <html>
@@ -214,11 +340,81 @@ def test_scrape_site_without_pagination(monkeypatch):
     assert {item.price for item in results} == {"$8.00"}
 
 
-def test_format_summary():
-    import importlib
+def test_scrape_site_skips_pages_disallowed_by_robots(server, monkeypatch):
+    from urllib.robotparser import RobotFileParser
+
+    pages = {
+        "https://example.com/products": """
+            <html>
+              <body>
+                <span class='price'>$10.00</span>
+                <a href='/products?page=2' class='next'>Next</a>
+              </body>
+            </html>
+        """,
+    }
+
+    fetched: list[str] = []
+
+    def fake_fetch(url: str) -> str:
+        fetched.append(url)
+        return pages[url]
+
+    def fake_robots(url: str) -> RobotFileParser:
+        parser = RobotFileParser()
+        parser.parse(["User-agent: *", "Disallow: /products?page="])
+        return parser
 
-    server = importlib.reload(importlib.import_module("server"))
+    monkeypatch.setattr(server, "fetch", fake_fetch)
+    monkeypatch.setattr(server, "_load_robots", fake_robots)
+
+    results, page_count = server.scrape_site(
+        "https://example.com/products", respect_robots=True
+    )
+
+    assert page_count == 1
+    assert {item.price for item in results} == {"$10.00"}
+    assert fetched == ["https://example.com/products"]
 
+
+@pytest.mark.parametrize(("status", "allowed"), [(401, False), (403, False), (404, True)])
+def test_robots_http_errors_follow_stdlib_rules(server, monkeypatch, status, allowed):
+    from urllib.error import HTTPError
+
+    def fake_fetch(url: str) -> str:
+        assert url == "https://example.com/robots.txt"
+        raise HTTPError(url, status, "error", {}, None)
+
+    monkeypatch.setattr(server, "_fetch_with_urllib", fake_fetch)
+
+    assert server._robots_allows("https://example.com/products?page=2", {}) is allowed
+
+
+def test_robots_with_unknown_charset_does_not_stop_crawl(server, monkeypatch):
+    class DummyResponse:
+        status = 200
+        reason = "OK"
+        headers = {"Content-Type": "text/plain; charset=bogus"}
+        data = b"User-agent: *\nDisallow: /\n"
+
+    class DummyPool:
+        def request(self, method, url):
+            return DummyResponse()
+
+    monkeypatch.setattr(server, "_HTTP", DummyPool())
+
+    assert server._robots_allows("https://example.com/products?page=2", {})
+
+
+def test_robots_rules_match_product_token(server, monkeypatch):
+    robots_text = "User-agent: pricing-scrapper\nDisallow: /products\n"
+    monkeypatch.setattr(server, "_fetch_with_urllib", lambda url: robots_text)
+
+    assert not server._robots_allows("https://example.com/products?page=2", {})
+    assert server._robots_allows("https://example.com/about", {})
+
+
+def test_format_summary(server):
     assert (
         server._format_summary(5, 1)
         == "5 products have been scrapped from 1 page"
@@ -227,3 +423,134 @@ def test_format_summary():
         server._format_summary(3, 4)
         == "3 products have been scrapped from 4 pages"
     )
+
+
+def test_extract_url_param(server):
+    assert (
+        server._extract_url_param("q=1&url=https%3A%2F%2Fexample.com%2F%3Fa%3D1+2")
+        == "https://example.com/?a=1 2"
+    )
+    assert server._extract_url_param("url=&url=example.com") == "example.com"
+    assert server._extract_url_param("other=1") == ""
+    assert server._extract_url_param("") == ""
+
+
+def test_render_page_escapes_dynamic_fragments(server):
+    from pricing_scrapper.scraper import PriceResult
+
+    body = server.render_page(
+        url='https://example.com/?q="<x>"',
+        summary="1 products have been scrapped from 1 page",
+        results=[PriceResult(description="Кава <b>", price="1 675 ₴")],
+    )
+
+    assert isinstance(body, bytes)
+    text = body.decode("utf-8")
+    assert 'value="https://example.com/?q=&quot;&lt;x&gt;&quot;"' in text
+    assert "<tr><td>Кава &lt;b&gt;</td><td>1 675 ₴</td><td></td></tr>" in text
+    assert '<p class="summary">' in text
+    assert "width: 100%;" in text
+
+
+def test_discover_pagination_urls_ignores_scripts_and_comments(server):
+    html_text = """
+        <article><abbr>p.</abbr></article>
+        <script>document.write("<a href='?page=7'>Next</a>");</script>
+        <!-- <a href='?page=8'>Next</a> -->
+        <nav><A HREF='?page=2' class='next'>Next</A></nav>
+    """
+
+    assert server._discover_pagination_urls(html_text, "https://example.com/c/") == [
+        "https://example.com/c/?page=2"
+    ]
+
+
+@pytest.mark.parametrize(
+    "opening",
+    ['<a name="top">', '<a href="#top" />'],
+    ids=["unclosed", "self-closing"],
+)
+def test_discover_pagination_urls_after_anchor_without_close_tag(server, opening):
+    html_text = (
+        f"{opening}<h1>Shop</h1>"
+        "<script>el.innerHTML='<a href=\"/cart\">Cart</a>';</script>"
+        '<nav><a href="?page=2">Next</a></nav>'
+    )
+
+    assert server._discover_pagination_urls(html_text, "https://e.com/c/") == [
+        "https://e.com/c/?page=2"
+    ]
+
+
+def test_run_scrape_uses_worker_pool(server, monkeypatch):
+    import threading
+
+    calls: list[tuple[str, bool, str]] = []
+
+    def fake_scrape_site(url: str, *, respect_robots: bool = False):
+        calls.append((url, respect_robots, threading.current_thread().name))
+        return [], 1
+
+    monkeypatch.setattr(server, "scrape_site", fake_scrape_site)
+
+    assert server._run_scrape("https://example.com") == ([], 1)
+    assert calls[0][:2] == ("https://example.com", True)
+    assert calls[0][2].startswith("scrape")
+
+
+def test_run_scrape_rejects_when_all_slots_taken(server, monkeypatch):
+    import threading
+
+    monkeypatch.setattr(server, "_SCRAPE_SLOTS", threading.BoundedSemaphore(1))
+    server._SCRAPE_SLOTS.acquire()
+
+    with pytest.raises(server._ScraperBusyError):
+        server._run_scrape("https://example.com")
+
+
+def test_run_scrape_keeps_worker_timeouts_apart_from_slow_jobs(server, monkeypatch):
+    import threading
+
+    def timing_out_scrape_site(url: str, *, respect_robots: bool = False):
+        raise TimeoutError("timed out")
+
+    monkeypatch.setattr(server, "scrape_site", timing_out_scrape_site)
+
+    with pytest.raises(TimeoutError) as exc:
+        server._run_scrape("https://example.com")
+    assert not isinstance(exc.value, server._ScrapeTimeoutError)
+
+    release = threading.Event()
+    monkeypatch.setattr(server, "SCRAPE_TIMEOUT_SECONDS", 0.01)
+    monkeypatch.setattr(
+        server, "scrape_site", lambda url, *, respect_robots=False: release.wait(5)
+    )
+    try:
+        with pytest.raises(server._ScrapeTimeoutError):
+            server._run_scrape("https://example.com")
+    finally:
+        release.set()
+
+
+@pytest.mark.parametrize(
+    ("raised", "message"),
+    [
+        (TimeoutError("timed out"), "timed out"),
+        (ConnectionResetError("connection reset"), "connection reset"),
+    ],
+)
+def test_handle_scrape_reports_worker_os_errors(server, monkeypatch, raised, message):
+    from types import SimpleNamespace
+
+    def failing_run_scrape(url: str):
+        raise raised
+
+    sent: list[bytes] = []
+    handler = SimpleNamespace(_send_response=lambda body, status: sent.append(body))
+    monkeypatch.setattr(server, "_run_scrape", failing_run_scrape)
+
+    server.ScraperHandler._handle_scrape(handler, "https://example.com")
+
+    text = sent[0].decode("utf-8")
+    assert message in text
+    assert "did not finish" not in text